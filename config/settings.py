@@ -3,7 +3,12 @@
 デフォルト設定とアプリケーション定数
 """
 
+import functools
 import os
+from types import MappingProxyType
+from typing import Any, Mapping
+
+from utils.pattern_utils import compile_exclusion_patterns
 
 # アプリケーション情報
 APP_NAME = "File Organizer"
@@ -16,6 +21,7 @@ DATA_DIR = os.path.join(BASE_DIR, "data")
 RULES_DIR = os.path.join(DATA_DIR, "rules")
 LOGS_DIR = os.path.join(DATA_DIR, "logs")
 BACKUPS_DIR = os.path.join(DATA_DIR, "backups")
+HASH_CACHE_FILE = os.path.join(DATA_DIR, "hash_cache.json")
 
 # ログ設定
 LOG_RETENTION_DAYS = 30  # ログの保持日数
@@ -31,13 +37,16 @@ SKIP_EXISTING_FILES = True       # 既存ファイルをスキップするか
 SKIP_HIDDEN_FILES = True         # 隠しファイルをスキップするか
 
 # ハッシュ計算設定
-HASH_ALGORITHM = "sha256"        # 使用するハッシュアルゴリズム
+HASH_ALGORITHM = "xxh3_128"      # 使用するハッシュアルゴリズム（xxhash未導入時はblake2b）
 HASH_CHUNK_SIZE = 8192           # ハッシュ計算時のチャンクサイズ（バイト）
 USE_QUICK_SCAN = True            # 高速スキャンを使用するか
+HASH_CACHE_SIZE = 100_000        # ハッシュキャッシュの最大エントリ数
+HASH_CACHE_MAX_AGE = 30 * 24 * 60 * 60  # 保存するハッシュキャッシュのエントリの保持期間（秒）
 
 # フォルダ監視設定
 WATCH_RECURSIVE = True           # サブディレクトリも監視するか
 WATCH_DELAY = 2.0               # ファイル作成後の待機時間（秒）
+WATCH_POLLING_INTERVAL = 60.0    # 変更通知を使えない場合（ネットワークドライブなど）の走査の間隔（秒）
 
 # GUI設定
 WINDOW_WIDTH = 900
@@ -66,6 +75,11 @@ DEFAULT_EXTENSION_CATEGORIES = {
     "Databases": [".db", ".sqlite", ".sql", ".mdb"],
 }
 
+# 変更不可のデフォルト拡張子カテゴリ（キャッシュされたデフォルトルールから参照）
+DEFAULT_EXTENSION_CATEGORIES_FROZEN = MappingProxyType(
+    {category: tuple(extensions) for category, extensions in DEFAULT_EXTENSION_CATEGORIES.items()}
+)
+
 # デフォルトファイル名パターン
 DEFAULT_PATTERNS = {
     "Screenshots": r"^screenshot[_-].*",
@@ -92,23 +106,32 @@ EXCLUDED_PATTERNS = [
     r".*\.part$",          # 部分ダウンロード
 ]
 
+# 前方・後方一致で判定できるパターンは正規表現を使わない判定器
+EXCLUDED_PATTERN_MATCHER = compile_exclusion_patterns(EXCLUDED_PATTERNS)
+
+
+def is_excluded(name: str) -> bool:
+    """ファイル名が除外パターンのいずれかに一致するかを判定"""
+    return EXCLUDED_PATTERN_MATCHER.match(name)
+
+
 # 除外するファイル名
-EXCLUDED_FILES = [
+EXCLUDED_FILES = frozenset({
     "Thumbs.db",
     "desktop.ini",
     ".DS_Store",
     ".gitkeep",
-]
+})
 
 # 除外するディレクトリ名
-EXCLUDED_DIRECTORIES = [
+EXCLUDED_DIRECTORIES = frozenset({
     ".git",
     ".svn",
     "node_modules",
     "__pycache__",
     "venv",
     ".venv",
-]
+})
 
 # パフォーマンス設定
 MAX_WORKERS = 4              # 並列処理の最大ワーカー数
@@ -129,36 +152,80 @@ def ensure_directories() -> None:
     ]
 
     for directory in directories:
-        os.makedirs(directory, exist_ok=True)
+        _ensure_directory(directory)
+
+
+@functools.lru_cache(maxsize=None)
+def _ensure_directory(directory: str) -> str:
+    """ディレクトリを作成してパスを返す（プロセスごとに一度だけ実行）"""
+    os.makedirs(directory, exist_ok=True)
+    return directory
+
 
+def get_rules_dir() -> str:
+    """ルールディレクトリのパスを取得（初回呼び出し時に作成）"""
+    return _ensure_directory(RULES_DIR)
 
-def get_default_rule() -> dict:
-    """デフォルトのルール設定を取得"""
-    return {
+
+def get_logs_dir() -> str:
+    """ログディレクトリのパスを取得（初回呼び出し時に作成）"""
+    return _ensure_directory(LOGS_DIR)
+
+
+def get_backups_dir() -> str:
+    """バックアップディレクトリのパスを取得（初回呼び出し時に作成）"""
+    return _ensure_directory(BACKUPS_DIR)
+
+
+def get_hash_cache_file() -> str:
+    """ハッシュキャッシュファイルのパスを取得（保存先のディレクトリは初回呼び出し時に作成）"""
+    _ensure_directory(DATA_DIR)
+    return HASH_CACHE_FILE
+
+
+@functools.lru_cache(maxsize=1)
+def get_default_rule() -> Mapping[str, Any]:
+    """
+    デフォルトのルール設定を取得
+
+    結果はキャッシュされ、変更不可のオブジェクトとして共有される。
+    編集する場合は get_default_rule_mutable() を使用する。
+    """
+    return MappingProxyType({
         "name": "Default Rule",
         "version": "1.0",
         "description": "デフォルトのファイル整理ルール",
-        "priority": ["pattern", "extension", "date"],
-        "rules": [
-            {
+        "priority": ("pattern", "extension", "date"),
+        "rules": (
+            MappingProxyType({
                 "type": "extension",
                 "enabled": True,
-                "categories": DEFAULT_EXTENSION_CATEGORIES
-            },
-            {
+                "categories": DEFAULT_EXTENSION_CATEGORIES_FROZEN
+            }),
+            MappingProxyType({
                 "type": "date",
                 "enabled": True,
                 "mode": "modified",
                 "format": DEFAULT_DATE_FORMAT
-            },
-            {
+            }),
+            MappingProxyType({
                 "type": "pattern",
                 "enabled": True,
-                "patterns": DEFAULT_PATTERNS
-            }
-        ]
-    }
+                "patterns": MappingProxyType(DEFAULT_PATTERNS.copy())
+            })
+        )
+    })
+
+
+def get_default_rule_mutable() -> dict:
+    """デフォルトのルール設定を編集可能なコピーとして取得"""
+    return _thaw(get_default_rule())
 
 
-# 初期化時にディレクトリを作成
-ensure_directories()
+def _thaw(value: Any) -> Any:
+    """変更不可のオブジェクトを通常の dict / list に再帰的に変換"""
+    if isinstance(value, Mapping):
+        return {key: _thaw(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_thaw(item) for item in value]
+    return value
@@ -1,13 +1,21 @@
 """
 コアモジュール
 ファイル整理の中核機能を提供
+
+起動時間を短縮するため、各クラスは初回アクセス時にインポートする（PEP 562）。
+FolderWatcher を使用しない限り watchdog は読み込まれない。
 """
 
-from .classifier import FileClassifier
-from .file_manager import FileOrganizer
-from .duplicate_detector import DuplicateDetector
-from .rule_engine import RuleEngine
-from .watcher import FolderWatcher
+import importlib
+
+# 公開名: 定義しているサブモジュール
+_LAZY_IMPORTS = {
+    'FileClassifier': '.classifier',
+    'FileOrganizer': '.file_manager',
+    'DuplicateDetector': '.duplicate_detector',
+    'RuleEngine': '.rule_engine',
+    'FolderWatcher': '.watcher',
+}
 
 __all__ = [
     'FileClassifier',
@@ -16,3 +24,18 @@ __all__ = [
     'RuleEngine',
     'FolderWatcher'
 ]
+
+
+def __getattr__(name: str):
+    """公開クラスを初回アクセス時にインポート"""
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value  # 以降のアクセスはモジュール属性として直接解決
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
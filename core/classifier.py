@@ -5,8 +5,41 @@
 
 import os
 import re
+from bisect import bisect_left
 from datetime import datetime
-from typing import Optional, Dict, List
+from typing import Collection, Iterable, Optional, Dict, List, Pattern, Tuple, Union
+
+# 番号付き後方参照（\1 など）
+_NUMBERED_BACKREFERENCE = re.compile(r"\\[1-9]")
+
+# パスの区切り文字
+_SEPARATORS = os.sep + (os.altsep or '')
+
+# 何にも一致しない正規表現（有効なパターンが1つもない場合に使用）
+_NEVER_MATCH = re.compile(r"(?!)")
+
+
+def _normalize_extensions(extensions: List[str]) -> List[str]:
+    """拡張子を小文字・ドット付きの形式にそろえる"""
+    return [ext.lower() if ext.startswith('.') else f'.{ext.lower()}'
+            for ext in extensions]
+
+
+def lower_extension(filename: str) -> str:
+    """
+    ファイル名から小文字の拡張子を取得（os.path.splitext()の拡張子部分と同等）
+
+    パスではなくファイル名を受け取ることで、区切り文字の探索を省略する。
+
+    Args:
+        filename: ファイル名
+
+    Returns:
+        ドット付きの小文字の拡張子（例: ".jpg"）。拡張子がない場合は空文字列
+    """
+    # os.path.splitext()と同様に先頭のドットは拡張子として扱わない
+    base, dot, suffix = filename.rpartition('.')
+    return '.' + suffix.lower() if dot and base.lstrip('.') else ''
 
 
 class FileClassifier:
@@ -27,6 +60,13 @@ class FileClassifier:
         "Databases": [".db", ".sqlite", ".sql", ".mdb"],
     }
 
+    # デフォルトのサイズ閾値（バイト単位）
+    DEFAULT_SIZE_THRESHOLDS = {
+        "Small": 1 * 1024 * 1024,        # 1MB
+        "Medium": 100 * 1024 * 1024,     # 100MB
+        "Large": 1024 * 1024 * 1024,     # 1GB
+    }
+
     def __init__(self, custom_categories: Optional[Dict[str, List[str]]] = None):
         """
         Args:
@@ -36,6 +76,45 @@ class FileClassifier:
         if custom_categories:
             self.categories.update(custom_categories)
 
+        # 拡張子 → カテゴリ名の逆引き辞書
+        self._ext_to_category: Dict[str, str] = {}
+        self._rebuild_extension_index()
+
+        # コンパイル済み正規表現のキャッシュ（パターン文字列: Pattern、不正な場合はNone）
+        self._compiled_patterns: Dict[str, Optional[Pattern]] = {}
+
+        # 結合済みパターンのキャッシュ（パターン辞書の項目: (正規表現, カテゴリ名リスト)）
+        self._pattern_sets: Dict[Tuple, Tuple[Optional[Pattern], List[str]]] = {}
+
+        # 昇順ソート済みのサイズ閾値のキャッシュ（閾値の項目: (閾値リスト, カテゴリ名リスト)）
+        self._sorted_thresholds: Dict[Tuple, Tuple[List[int], List[str]]] = {}
+
+    def _rebuild_extension_index(self) -> None:
+        """拡張子の逆引き辞書を再構築（先に定義されたカテゴリを優先）"""
+        self._ext_to_category = self.build_extension_index()
+
+    def build_extension_index(self, overrides: Optional[Dict[str, List[str]]] = None) -> Dict[str, str]:
+        """
+        拡張子 → カテゴリ名の逆引き辞書を作成（現在のカテゴリ設定は変更しない）
+
+        Args:
+            overrides: 追加・置換するカテゴリ辞書（add_category()と同じ扱い）
+
+        Returns:
+            逆引き辞書（同じ拡張子は先に定義されたカテゴリを優先）
+        """
+        categories = self.categories
+        if overrides:
+            categories = dict(categories)
+            for category, extensions in overrides.items():
+                categories[category] = _normalize_extensions(extensions)
+
+        ext_to_category = {}
+        for category, extensions in categories.items():
+            for ext in extensions:
+                ext_to_category.setdefault(ext, category)
+        return ext_to_category
+
     def classify_by_extension(self, file_path: str) -> str:
         """
         拡張子に基づいてファイルを分類
@@ -47,16 +126,11 @@ class FileClassifier:
             カテゴリ名（該当なしの場合は "Others"）
         """
         _, ext = os.path.splitext(file_path)
-        ext = ext.lower()
-
-        for category, extensions in self.categories.items():
-            if ext in extensions:
-                return category
-
-        return "Others"
+        return self._ext_to_category.get(ext.lower(), "Others")
 
     def classify_by_date(self, file_path: str, mode: str = 'modified',
-                        date_format: str = '%Y/%m') -> Optional[str]:
+                        date_format: str = '%Y/%m',
+                        stat_result: Optional[os.stat_result] = None) -> Optional[str]:
         """
         日付に基づいてファイルを分類
 
@@ -64,23 +138,27 @@ class FileClassifier:
             file_path: ファイルのパス
             mode: 'created' (作成日) または 'modified' (更新日)
             date_format: 日付フォルダの形式（例: '%Y/%m' → '2026/01'）
+            stat_result: 取得済みのstat情報（省略時はos.statを呼び出す）
 
         Returns:
             日付フォルダのパス（例: "2026/01"）。エラー時はNone
         """
         try:
-            if not os.path.exists(file_path):
-                return None
+            if stat_result is None:
+                try:
+                    stat_result = os.stat(file_path)
+                except FileNotFoundError:
+                    return None
 
             if mode == 'created':
                 # 作成日時を取得
-                timestamp = os.path.getctime(file_path)
+                timestamp = stat_result.st_ctime
             elif mode == 'modified':
                 # 更新日時を取得
-                timestamp = os.path.getmtime(file_path)
+                timestamp = stat_result.st_mtime
             else:
                 print(f"警告: 不明なモード '{mode}'。'modified'を使用します。")
-                timestamp = os.path.getmtime(file_path)
+                timestamp = stat_result.st_mtime
 
             date = datetime.fromtimestamp(timestamp)
             return date.strftime(date_format)
@@ -90,7 +168,8 @@ class FileClassifier:
             return None
 
     def classify_by_size(self, file_path: str,
-                        thresholds: Optional[Dict[str, int]] = None) -> str:
+                        thresholds: Optional[Dict[str, int]] = None,
+                        stat_result: Optional[os.stat_result] = None) -> str:
         """
         ファイルサイズに基づいて分類
 
@@ -98,26 +177,24 @@ class FileClassifier:
             file_path: ファイルのパス
             thresholds: サイズの閾値辞書（バイト単位）
                        デフォルト: {"Small": 1MB, "Medium": 100MB, "Large": 1GB}
+            stat_result: 取得済みのstat情報（省略時はos.statを呼び出す）
 
         Returns:
             サイズカテゴリ名
         """
         if thresholds is None:
-            thresholds = {
-                "Small": 1 * 1024 * 1024,        # 1MB
-                "Medium": 100 * 1024 * 1024,     # 100MB
-                "Large": 1024 * 1024 * 1024,     # 1GB
-            }
+            thresholds = self.DEFAULT_SIZE_THRESHOLDS
 
         try:
-            file_size = os.path.getsize(file_path)
-
-            # サイズを昇順でソートした閾値で判定
-            sorted_thresholds = sorted(thresholds.items(), key=lambda x: x[1])
+            if stat_result is None:
+                stat_result = os.stat(file_path)
+            file_size = stat_result.st_size
 
-            for category, threshold in sorted_thresholds:
-                if file_size <= threshold:
-                    return category
+            # 昇順ソート済みの閾値を二分探索（file_size <= 閾値 となる最初のカテゴリ）
+            values, names = self._get_sorted_thresholds(thresholds)
+            index = bisect_left(values, file_size)
+            if index < len(names):
+                return names[index]
 
             # すべての閾値を超える場合
             return "VeryLarge"
@@ -126,6 +203,25 @@ class FileClassifier:
             print(f"エラー: ファイルサイズの取得に失敗しました: {file_path} - {e}")
             return "Unknown"
 
+    def _get_sorted_thresholds(self, thresholds: Dict[str, int]) -> Tuple[List[int], List[str]]:
+        """
+        サイズ閾値を昇順にソートした結果を取得（結果はキャッシュされる）
+
+        Args:
+            thresholds: サイズの閾値辞書（バイト単位）
+
+        Returns:
+            (閾値のリスト, カテゴリ名のリスト) のタプル
+        """
+        key = tuple(thresholds.items())
+        cached = self._sorted_thresholds.get(key)
+        if cached is None:
+            sorted_items = sorted(thresholds.items(), key=lambda x: x[1])
+            cached = ([value for _, value in sorted_items],
+                      [name for name, _ in sorted_items])
+            self._sorted_thresholds[key] = cached
+        return cached
+
     def classify_by_pattern(self, file_path: str,
                            patterns: Dict[str, str]) -> Optional[str]:
         """
@@ -140,18 +236,92 @@ class FileClassifier:
             マッチしたカテゴリ名。マッチしない場合はNone
         """
         filename = os.path.basename(file_path)
+        combined, categories = self._compile_pattern_set(patterns)
+
+        if combined is not None:
+            match = combined.match(filename)
+            # 一致した代替パターンのグループ名（_p<番号>）からカテゴリを求める
+            return categories[int(match.lastgroup[2:])] if match else None
 
         for category, pattern in patterns.items():
-            try:
-                if re.match(pattern, filename, re.IGNORECASE):
-                    return category
-            except re.error as e:
-                print(f"警告: 不正な正規表現パターン '{pattern}': {e}")
-                continue
+            compiled = self._compile_pattern(pattern)
+            if compiled is not None and compiled.match(filename):
+                return category
 
         return None
 
-    def classify_multi(self, file_path: str, rules: List[Dict]) -> Dict[str, str]:
+    def _compile_pattern_set(self, patterns: Union[Dict[str, str], Iterable[Tuple[str, str]]]
+                             ) -> Tuple[Optional[Pattern], List[str]]:
+        """
+        パターン辞書を1つの正規表現（名前付きグループの選択）にコンパイル
+
+        先頭の選択肢から順に試されるため、辞書の順に評価した場合と同じ
+        カテゴリが一致する。結果はキャッシュされる。
+
+        Args:
+            patterns: パターン辞書（カテゴリ名: 正規表現パターン）、
+                     または (カテゴリ名, 正規表現パターン) のタプルの列
+
+        Returns:
+            (結合した正規表現, グループ番号順のカテゴリ名リスト) のタプル。
+            番号付き後方参照を含むなど結合できない場合、正規表現はNone
+        """
+        key = tuple(patterns.items()) if isinstance(patterns, dict) else tuple(patterns)
+        cached = self._pattern_sets.get(key)
+        if cached is not None:
+            return cached
+
+        alternatives = []
+        categories = []
+        combined = None
+
+        for category, pattern in key:
+            # 不正なパターンは警告を出して除外
+            if self._compile_pattern(pattern) is None:
+                continue
+            alternatives.append(f"(?P<_p{len(categories)}>{pattern})")
+            categories.append(category)
+
+        # 番号付き後方参照はグループ番号がずれるため結合しない
+        if alternatives and not any(_NUMBERED_BACKREFERENCE.search(p) for _, p in key):
+            try:
+                combined = re.compile("|".join(alternatives), re.IGNORECASE)
+            except re.error:
+                combined = None
+        elif not alternatives:
+            combined = _NEVER_MATCH
+
+        cached = (combined, categories)
+        self._pattern_sets[key] = cached
+        return cached
+
+    def _compile_pattern(self, pattern: str) -> Optional[Pattern]:
+        """
+        正規表現パターンをコンパイル（結果はキャッシュされる）
+
+        Args:
+            pattern: 正規表現パターン
+
+        Returns:
+            コンパイル済みパターン。不正なパターンの場合はNone
+        """
+        try:
+            return self._compiled_patterns[pattern]
+        except KeyError:
+            pass
+
+        try:
+            compiled = re.compile(pattern, re.IGNORECASE)
+        except re.error as e:
+            print(f"警告: 不正な正規表現パターン '{pattern}': {e}")
+            compiled = None
+
+        self._compiled_patterns[pattern] = compiled
+        return compiled
+
+    def classify_multi(self, file_path: str, rules: List[Dict],
+                       needed_keys: Optional[Collection[str]] = None,
+                       stat_result: Optional[os.stat_result] = None) -> Dict[str, str]:
         """
         複数のルールを適用してファイルを分類
 
@@ -159,6 +329,9 @@ class FileClassifier:
             file_path: ファイルのパス
             rules: ルールのリスト
                   各ルールは {'type': 'extension'|'date'|'size'|'pattern', ...} の形式
+            needed_keys: 必要な分類キー（get_destination_path()の優先順位など）。
+                        指定した場合、含まれないタイプのルールは評価しない
+            stat_result: 取得済みのstat情報（省略時は日付・サイズの判定ごとに取得）
 
         Returns:
             分類結果の辞書 {'extension': 'Images', 'date': '2026/01', ...}
@@ -168,19 +341,25 @@ class FileClassifier:
         for rule in rules:
             rule_type = rule.get('type')
 
+            # 目的地パスに使われない分類は計算しない（日付・サイズのstatを省略）
+            if needed_keys is not None and rule_type not in needed_keys:
+                continue
+
             if rule_type == 'extension':
                 results['extension'] = self.classify_by_extension(file_path)
 
             elif rule_type == 'date':
                 mode = rule.get('mode', 'modified')
                 date_format = rule.get('format', '%Y/%m')
-                date_folder = self.classify_by_date(file_path, mode, date_format)
+                date_folder = self.classify_by_date(file_path, mode, date_format,
+                                                    stat_result=stat_result)
                 if date_folder:
                     results['date'] = date_folder
 
             elif rule_type == 'size':
                 thresholds = rule.get('thresholds')
-                results['size'] = self.classify_by_size(file_path, thresholds)
+                results['size'] = self.classify_by_size(file_path, thresholds,
+                                                        stat_result=stat_result)
 
             elif rule_type == 'pattern':
                 patterns = rule.get('patterns', {})
@@ -190,6 +369,76 @@ class FileClassifier:
 
         return results
 
+    def classify_batch(self, entries: List[os.DirEntry], rules: List[Dict]) -> List[Dict[str, str]]:
+        """
+        os.scandir()のエントリをまとめて分類
+
+        パターンのコンパイルやルールの解釈をループの外で一度だけ行い、
+        stat情報はDirEntryにキャッシュされたものを使用する。
+
+        Args:
+            entries: os.scandir()で取得したエントリのリスト
+            rules: ルールのリスト（classify_multi()と同じ形式）
+
+        Returns:
+            entriesと同じ順序の分類結果の辞書のリスト
+        """
+        use_extension = False
+        date_rules = []
+        size_rules = []
+        pattern_rules = []
+
+        for rule in rules:
+            rule_type = rule.get('type')
+            if rule_type == 'extension':
+                use_extension = True
+            elif rule_type == 'date':
+                date_rules.append((rule.get('mode', 'modified'), rule.get('format', '%Y/%m')))
+            elif rule_type == 'size':
+                size_rules.append(rule.get('thresholds'))
+            elif rule_type == 'pattern':
+                pattern_rules.append(rule.get('patterns', {}))
+
+        needs_stat = bool(date_rules or size_rules)
+        ext_to_category = self._ext_to_category
+        results_list = []
+
+        for entry in entries:
+            name = entry.name
+            results = {}
+
+            if use_extension:
+                results['extension'] = ext_to_category.get(lower_extension(name), "Others")
+
+            stat_result = None
+            if needs_stat:
+                try:
+                    stat_result = entry.stat()
+                except OSError as e:
+                    print(f"エラー: ファイル情報の取得に失敗しました: {entry.path} - {e}")
+
+            if stat_result is not None:
+                for mode, date_format in date_rules:
+                    date_folder = self.classify_by_date(entry.path, mode, date_format,
+                                                        stat_result=stat_result)
+                    if date_folder:
+                        results['date'] = date_folder
+
+                for thresholds in size_rules:
+                    results['size'] = self.classify_by_size(entry.path, thresholds,
+                                                            stat_result=stat_result)
+            elif size_rules:
+                results['size'] = "Unknown"
+
+            for patterns in pattern_rules:
+                category = self.classify_by_pattern(name, patterns)
+                if category:
+                    results['pattern'] = category
+
+            results_list.append(results)
+
+        return results_list
+
     def get_destination_path(self, file_path: str, base_dir: str,
                            classification: Dict[str, str],
                            priority: Optional[List[str]] = None) -> str:
@@ -209,17 +458,24 @@ class FileClassifier:
             priority = ['pattern', 'extension', 'date', 'size']
 
         # 優先順位に従ってパスコンポーネントを構築
-        path_components = [base_dir]
+        # （各要素は区切り文字を含まない分類名なので os.path.join の検査は不要）
+        root = base_dir.rstrip(_SEPARATORS) or base_dir
+        path_components = [root] if root else []
 
         for key in priority:
-            if key in classification:
-                path_components.append(classification[key])
+            component = classification.get(key)
+            if component:
+                path_components.append(component)
 
         # ファイル名を追加
         filename = os.path.basename(file_path)
         path_components.append(filename)
 
-        return os.path.join(*path_components)
+        if root and root[-1] in _SEPARATORS:
+            # ルートディレクトリ（"/" など）の場合は区切り文字を重ねない
+            return root + os.sep.join(path_components[1:])
+
+        return os.sep.join(path_components)
 
     def add_category(self, category_name: str, extensions: List[str]) -> None:
         """
@@ -229,8 +485,16 @@ class FileClassifier:
             category_name: カテゴリ名
             extensions: 拡張子のリスト
         """
-        self.categories[category_name] = [ext.lower() if ext.startswith('.') else f'.{ext.lower()}'
-                                         for ext in extensions]
+        normalized = _normalize_extensions(extensions)
+
+        if category_name not in self.categories:
+            # 末尾への追加なので既存の対応付けより優先度は低い
+            self.categories[category_name] = normalized
+            for ext in normalized:
+                self._ext_to_category.setdefault(ext, category_name)
+        elif self.categories[category_name] != normalized:
+            self.categories[category_name] = normalized
+            self._rebuild_extension_index()
 
     def remove_category(self, category_name: str) -> bool:
         """
@@ -244,6 +508,7 @@ class FileClassifier:
         """
         if category_name in self.categories:
             del self.categories[category_name]
+            self._rebuild_extension_index()
             return True
         return False
 
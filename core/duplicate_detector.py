@@ -3,22 +3,39 @@
 ハッシュ値を使用して重複ファイルを検出
 """
 
+import json
 import os
-from typing import List, Dict, Optional, Set
-from collections import defaultdict
-from utils.hash_utils import calculate_file_hash, get_quick_file_signature
+import threading
+import time
+from typing import FrozenSet, Iterator, List, Dict, Optional, Set, Tuple
+from collections import OrderedDict, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from utils.format_utils import format_size
+from utils.hash_utils import calculate_file_hash, get_quick_file_signature, resolve_hash_algorithm
+from config.settings import EXCLUDED_DIRECTORIES, EXCLUDED_FILES, HASH_CACHE_SIZE, MAX_WORKERS
 
 
 class DuplicateDetector:
     """重複ファイルを検出するクラス"""
 
-    def __init__(self, hash_algorithm: str = 'sha256'):
+    def __init__(self, hash_algorithm: str = 'xxh3_128',
+                 max_workers: Optional[int] = None,
+                 cache_size: int = HASH_CACHE_SIZE):
         """
         Args:
             hash_algorithm: 使用するハッシュアルゴリズム
+                           （xxhash未インストール時はhashlibのblake2bで代替）
+            max_workers: ハッシュ計算の並列ワーカー数
+                        （Noneの場合はMAX_WORKERS、HDD上のファイルでは1）
+            cache_size: ハッシュキャッシュの最大エントリ数
         """
         self.hash_algorithm = hash_algorithm
-        self.file_cache = {}  # ファイルパス: ハッシュ値のキャッシュ
+        self.max_workers = max_workers
+        self.cache_size = cache_size
+        self._cache_lock = threading.Lock()  # ワーカースレッド間でキャッシュを保護
+        # (ファイルパス, 更新日時ns, サイズ): (ハッシュ値, キャッシュ時刻) のLRUキャッシュ
+        self.file_cache: "OrderedDict[Tuple[str, int, int], Tuple[str, float]]" = OrderedDict()
+        self._stat_cache: Dict[str, os.stat_result] = {}  # ファイルパス: statのキャッシュ
 
     def scan_directory(self, path: str, recursive: bool = True,
                       include_hidden: bool = False,
@@ -37,45 +54,13 @@ class DuplicateDetector:
         """
         files = []
 
-        try:
-            if recursive:
-                for root, dirs, filenames in os.walk(path):
-                    # 隠しディレクトリをスキップ
-                    if not include_hidden:
-                        dirs[:] = [d for d in dirs if not d.startswith('.')]
-
-                    for filename in filenames:
-                        # 隠しファイルをスキップ
-                        if not include_hidden and filename.startswith('.'):
-                            continue
-
-                        file_path = os.path.join(root, filename)
-
-                        # 拡張子フィルタ
-                        if extensions:
-                            _, ext = os.path.splitext(filename)
-                            if ext.lower() not in extensions:
-                                continue
-
-                        if os.path.isfile(file_path):
-                            files.append(file_path)
-            else:
-                for item in os.listdir(path):
-                    # 隠しファイルをスキップ
-                    if not include_hidden and item.startswith('.'):
-                        continue
-
-                    file_path = os.path.join(path, item)
-
-                    if os.path.isfile(file_path):
-                        # 拡張子フィルタ
-                        if extensions:
-                            _, ext = os.path.splitext(item)
-                            if ext.lower() not in extensions:
-                                continue
-
-                        files.append(file_path)
+        # 先頭のドットを除いた小文字の拡張子に正規化
+        normalized_extensions = None
+        if extensions:
+            normalized_extensions = frozenset(ext.lstrip('.').lower() for ext in extensions)
 
+        try:
+            self._scan_entries(path, files, recursive, include_hidden, normalized_extensions)
         except PermissionError as e:
             print(f"警告: アクセス権限がありません: {path}")
         except Exception as e:
@@ -83,6 +68,64 @@ class DuplicateDetector:
 
         return files
 
+    def _scan_entries(self, directory: str, files: List[str], recursive: bool,
+                      include_hidden: bool, extensions: Optional[FrozenSet[str]]) -> None:
+        """
+        os.scandir()でディレクトリを走査してファイルパスをfilesに追加
+
+        DirEntryはreaddirで得た種別情報をキャッシュしているため、
+        ファイルごとの追加のstat呼び出しが不要になる。
+
+        Args:
+            directory: 走査するディレクトリのパス
+            files: 結果を追加するリスト
+            recursive: サブディレクトリも含めるか
+            include_hidden: 隠しファイルを含めるか
+            extensions: 対象とする拡張子（先頭のドットなし・小文字）のセット
+                        （Noneの場合は全て）
+        """
+        subdirs = []
+
+        with os.scandir(directory) as it:
+            for entry in it:
+                name = entry.name
+
+                # 隠しファイル・隠しディレクトリをスキップ
+                if not include_hidden and name.startswith('.'):
+                    continue
+
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        if recursive and name not in EXCLUDED_DIRECTORIES:
+                            subdirs.append(entry.path)
+                        continue
+
+                    if not entry.is_file():
+                        continue
+                except OSError:
+                    continue
+
+                # システムファイルをスキップ
+                if name in EXCLUDED_FILES:
+                    continue
+
+                # 拡張子フィルタ（os.path.splitext()と同様に先頭のドットは拡張子として扱わない）
+                if extensions:
+                    dot_index = name.rfind('.')
+                    if (dot_index <= 0 or not name[:dot_index].lstrip('.')
+                            or name[dot_index + 1:].lower() not in extensions):
+                        continue
+
+                files.append(entry.path)
+
+        # os.walk()と同様に、ファイルの後にサブディレクトリを順に走査
+        for subdir in subdirs:
+            try:
+                self._scan_entries(subdir, files, recursive, include_hidden, extensions)
+            except OSError:
+                # os.walk()と同様に読み込めないサブディレクトリは無視
+                continue
+
     def find_duplicates(self, file_list: List[str],
                        use_quick_scan: bool = True) -> Dict[str, List[str]]:
         """
@@ -95,6 +138,9 @@ class DuplicateDetector:
         Returns:
             重複グループの辞書 {ハッシュ値: [ファイルパスリスト]}
         """
+        # 前回のスキャン以降に変更されたファイルを検出できるようstatは取り直す
+        self._stat_cache.clear()
+
         if use_quick_scan:
             return self._find_duplicates_quick(file_list)
         else:
@@ -102,34 +148,51 @@ class DuplicateDetector:
 
     def _find_duplicates_quick(self, file_list: List[str]) -> Dict[str, List[str]]:
         """
-        高速な重複検出（2段階スキャン）
+        高速な重複検出（3段階スキャン）
 
-        1段階目: ファイルサイズと部分ハッシュで候補を絞る
-        2段階目: 候補のみ完全なハッシュで確認
+        1段階目: ファイルサイズでグループ化（ファイルの読み込みなし）
+        2段階目: サイズが一致するファイルのみ部分ハッシュで候補を絞る
+        3段階目: 候補のみ完全なハッシュで確認
         """
-        # 1段階目: 高速シグネチャでグループ化
+        # 1段階目: ファイルサイズでグループ化
+        size_groups = defaultdict(list)
+
+        print("1段階目: サイズで分類中...")
+        for file_path in file_list:
+            try:
+                size_groups[self._stat(file_path).st_size].append(file_path)
+            except OSError:
+                continue
+
+        same_size_files = [file_path for files in size_groups.values() if len(files) > 1
+                           for file_path in files]
+
+        # 2段階目: 高速シグネチャでグループ化
         signature_groups = defaultdict(list)
 
-        print("1段階目: 高速スキャン中...")
-        for i, file_path in enumerate(file_list, 1):
+        print(f"2段階目: {len(same_size_files)}個のファイルを高速スキャン中...")
+        for i, file_path in enumerate(same_size_files, 1):
             if i % 100 == 0:
-                print(f"  処理中: {i}/{len(file_list)}")
+                print(f"  処理中: {i}/{len(same_size_files)}")
 
             signature = get_quick_file_signature(file_path)
             if signature:
                 signature_groups[signature].append(file_path)
 
-        # 2段階目: 重複候補のみ完全なハッシュを計算
+        # 3段階目: 重複候補のみ完全なハッシュを計算
         duplicates = {}
         candidates = [files for files in signature_groups.values() if len(files) > 1]
 
         if candidates:
-            print(f"2段階目: {sum(len(group) for group in candidates)}個の候補を詳細スキャン中...")
+            print(f"3段階目: {sum(len(group) for group in candidates)}個の候補を詳細スキャン中...")
+            candidate_paths = [file_path for group in candidates for file_path in group]
+            file_hashes = dict(self._hash_files(candidate_paths))
+
             for group in candidates:
                 hash_groups = defaultdict(list)
 
                 for file_path in group:
-                    file_hash = self._get_file_hash(file_path)
+                    file_hash = file_hashes.get(file_path)
                     if file_hash:
                         hash_groups[file_hash].append(file_path)
 
@@ -147,38 +210,147 @@ class DuplicateDetector:
         hash_groups = defaultdict(list)
 
         print("完全スキャン中...")
-        for i, file_path in enumerate(file_list, 1):
+        for i, (file_path, file_hash) in enumerate(self._hash_files(file_list), 1):
             if i % 50 == 0:
                 print(f"  処理中: {i}/{len(file_list)}")
 
-            file_hash = self._get_file_hash(file_path)
             if file_hash:
                 hash_groups[file_hash].append(file_path)
 
         # 重複しているグループのみを返す
         return {h: files for h, files in hash_groups.items() if len(files) > 1}
 
+    def _hash_files(self, file_paths: List[str]) -> Iterator[Tuple[str, Optional[str]]]:
+        """
+        複数ファイルのハッシュをスレッドプールで計算
+
+        ハッシュ計算はI/O待ちとGILを解放するハッシュ処理が中心のため、
+        スレッドで並列化できる。結果は入力と同じ順序で返す。
+
+        Args:
+            file_paths: ファイルパスのリスト
+
+        Yields:
+            (ファイルパス, ハッシュ値) のタプル
+        """
+        workers = self._get_worker_count(file_paths)
+
+        if workers <= 1:
+            for file_path in file_paths:
+                yield file_path, self._get_file_hash(file_path)
+            return
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            yield from zip(file_paths, executor.map(self._get_file_hash, file_paths))
+
+    def _get_worker_count(self, file_paths: List[str]) -> int:
+        """
+        ハッシュ計算に使用するワーカー数を決定
+
+        Args:
+            file_paths: ファイルパスのリスト
+
+        Returns:
+            ワーカー数
+        """
+        if self.max_workers is not None:
+            return max(1, self.max_workers)
+
+        if len(file_paths) < 2:
+            return 1
+
+        # HDDではシークが増えて逆に遅くなるため並列化しない
+        if self._is_rotational(file_paths[0]):
+            return 1
+
+        return MAX_WORKERS
+
+    @staticmethod
+    def _is_rotational(file_path: str) -> bool:
+        """
+        ファイルが回転ディスク（HDD）上にあるかを判定（Linuxのみ）
+
+        Args:
+            file_path: ファイルのパス
+
+        Returns:
+            HDD上にあると判定できた場合True。判定できない場合はFalse
+        """
+        try:
+            st_dev = os.stat(file_path).st_dev
+            device_dir = f"/sys/dev/block/{os.major(st_dev)}:{os.minor(st_dev)}"
+
+            # パーティションの場合は親デバイスのqueueを参照
+            for queue_dir in (os.path.join(device_dir, "queue"),
+                              os.path.join(device_dir, "..", "queue")):
+                rotational_path = os.path.join(queue_dir, "rotational")
+                if os.path.exists(rotational_path):
+                    with open(rotational_path, 'r') as f:
+                        return f.read().strip() == "1"
+
+        except (OSError, AttributeError, ValueError):
+            pass
+
+        return False
+
     def _get_file_hash(self, file_path: str) -> Optional[str]:
         """
         ファイルのハッシュを取得（キャッシュを使用）
 
+        キャッシュのキーには更新日時とサイズを含めるため、
+        ファイルが変更されると自動的に再計算される。
+
         Args:
             file_path: ファイルのパス
 
         Returns:
             ハッシュ値。エラー時はNone
         """
+        try:
+            st = self._stat(file_path)
+        except OSError:
+            # エラーメッセージの出力はcalculate_file_hashに任せる
+            return calculate_file_hash(file_path, self.hash_algorithm)
+
+        key = (file_path, st.st_mtime_ns, st.st_size)
+
         # キャッシュをチェック
-        if file_path in self.file_cache:
-            return self.file_cache[file_path]
+        with self._cache_lock:
+            cached = self.file_cache.get(key)
+            if cached is not None:
+                self.file_cache.move_to_end(key)
+                return cached[0]
 
-        # ハッシュを計算
+        # ハッシュを計算（ロックの外で実行して並列化を妨げない）
         file_hash = calculate_file_hash(file_path, self.hash_algorithm)
         if file_hash:
-            self.file_cache[file_path] = file_hash
+            with self._cache_lock:
+                self.file_cache[key] = (file_hash, time.time())
+                self.file_cache.move_to_end(key)
+                while len(self.file_cache) > self.cache_size:
+                    self.file_cache.popitem(last=False)
 
         return file_hash
 
+    def _stat(self, file_path: str) -> os.stat_result:
+        """
+        ファイルのstat情報を取得（キャッシュを使用）
+
+        Args:
+            file_path: ファイルのパス
+
+        Returns:
+            stat情報
+
+        Raises:
+            OSError: stat情報を取得できない場合
+        """
+        st = self._stat_cache.get(file_path)
+        if st is None:
+            st = os.stat(file_path)
+            self._stat_cache[file_path] = st
+        return st
+
     def suggest_actions(self, duplicate_groups: Dict[str, List[str]],
                        keep_strategy: str = 'newest') -> List[Dict]:
         """
@@ -229,11 +401,13 @@ class DuplicateDetector:
         """
         if strategy == 'newest':
             # 最新のファイルを保持
-            return max(file_paths, key=lambda f: os.path.getmtime(f))
+            mtimes = [self._stat(f).st_mtime for f in file_paths]
+            return file_paths[max(range(len(mtimes)), key=mtimes.__getitem__)]
 
         elif strategy == 'oldest':
             # 最古のファイルを保持
-            return min(file_paths, key=lambda f: os.path.getmtime(f))
+            mtimes = [self._stat(f).st_mtime for f in file_paths]
+            return file_paths[min(range(len(mtimes)), key=mtimes.__getitem__)]
 
         elif strategy == 'shortest_path':
             # 最短パスのファイルを保持
@@ -260,7 +434,7 @@ class DuplicateDetector:
         total = 0
         for file_path in file_paths:
             try:
-                total += os.path.getsize(file_path)
+                total += self._stat(file_path).st_size
             except Exception:
                 continue
         return total
@@ -304,7 +478,7 @@ class DuplicateDetector:
         for files in duplicate_groups.values():
             if files:
                 try:
-                    file_size = os.path.getsize(files[0])
+                    file_size = self._stat(files[0]).st_size
                     total_size += file_size * len(files)
                     wasted_space += file_size * (len(files) - 1)
                 except Exception:
@@ -317,20 +491,96 @@ class DuplicateDetector:
             "duplicate_files": duplicate_files,
             "total_size_bytes": total_size,
             "wasted_space_bytes": wasted_space,
-            "wasted_space_formatted": self._format_size(wasted_space)
+            "wasted_space_formatted": format_size(wasted_space)
         }
 
-    @staticmethod
-    def _format_size(size_bytes: int) -> str:
+    def clear_cache(self) -> None:
+        """ハッシュキャッシュとstatキャッシュをクリア"""
+        with self._cache_lock:
+            self.file_cache.clear()
+        self._stat_cache.clear()
+
+    def trim_cache(self, max_age_seconds: float) -> int:
         """
-        バイト数を人間が読みやすい形式に変換
+        古いハッシュキャッシュのエントリを削除
+
+        Args:
+            max_age_seconds: 保持する最大経過時間（秒）
+
+        Returns:
+            削除したエントリ数
         """
-        for unit in ['B', 'KB', 'MB', 'GB', 'TB']:
-            if size_bytes < 1024.0:
-                return f"{size_bytes:.2f} {unit}"
-            size_bytes /= 1024.0
-        return f"{size_bytes:.2f} PB"
+        threshold = time.time() - max_age_seconds
 
-    def clear_cache(self) -> None:
-        """ハッシュキャッシュをクリア"""
-        self.file_cache.clear()
+        with self._cache_lock:
+            expired = [key for key, (_, cached_at) in self.file_cache.items()
+                       if cached_at < threshold]
+            for key in expired:
+                del self.file_cache[key]
+
+        return len(expired)
+
+    def save_cache(self, cache_path: str) -> bool:
+        """
+        ハッシュキャッシュをファイルに保存
+
+        Args:
+            cache_path: 保存先のパス
+
+        Returns:
+            成功したらTrue、失敗したらFalse
+        """
+        try:
+            with self._cache_lock:
+                entries = [[path, mtime_ns, size, file_hash, cached_at]
+                           for (path, mtime_ns, size), (file_hash, cached_at)
+                           in self.file_cache.items()]
+
+            # 代替のアルゴリズムで計算した場合はその名前を記録する
+            cache_data = {
+                "hash_algorithm": resolve_hash_algorithm(self.hash_algorithm),
+                "entries": entries
+            }
+
+            with open(cache_path, 'w', encoding='utf-8') as f:
+                json.dump(cache_data, f, ensure_ascii=False)
+
+            return True
+
+        except Exception as e:
+            print(f"エラー: ハッシュキャッシュの保存中にエラーが発生しました: {e}")
+            return False
+
+    def load_cache(self, cache_path: str) -> bool:
+        """
+        ファイルからハッシュキャッシュを読み込む
+
+        実際に使用されるハッシュアルゴリズムと異なるアルゴリズムで作成された
+        キャッシュは読み込まない（xxhash のインストール前後など）。
+
+        Args:
+            cache_path: キャッシュファイルのパス
+
+        Returns:
+            読み込んだらTrue、読み込まなかった場合はFalse
+        """
+        try:
+            with open(cache_path, 'r', encoding='utf-8') as f:
+                cache_data = json.load(f)
+
+            if cache_data.get("hash_algorithm") != resolve_hash_algorithm(self.hash_algorithm):
+                return False
+
+            with self._cache_lock:
+                for path, mtime_ns, size, file_hash, cached_at in cache_data.get("entries", []):
+                    self.file_cache[(path, mtime_ns, size)] = (file_hash, cached_at)
+                while len(self.file_cache) > self.cache_size:
+                    self.file_cache.popitem(last=False)
+
+            return True
+
+        except FileNotFoundError:
+            return False
+        except Exception as e:
+            print(f"エラー: ハッシュキャッシュの読み込み中にエラーが発生しました: {e}")
+            return False
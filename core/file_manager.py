@@ -3,12 +3,294 @@
 ファイルの移動、コピー、整理を実行
 """
 
+import ctypes
+import errno
 import os
+import queue
+import re
 import shutil
-from typing import List, Dict, Optional, Callable, Any
+import sys
+import threading
+from collections import Counter, defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Iterable, Iterator, List, Dict, Optional, Callable, Any, Pattern, Tuple
 from .rule_engine import RuleEngine
+from utils.format_utils import format_size
 from utils.logger import OperationLogger
 
+# 移動・コピーの並列ワーカー数の既定値（I/O待ちが中心のためCPU数より多くする）
+DEFAULT_IO_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+# 整理カテゴリディレクトリ（このツールが作成するディレクトリ）
+_ORGANIZED_DIRECTORIES = frozenset({
+    "Images", "Videos", "Documents", "Audio", "Archives",
+    "Code", "Others", "Small", "Medium", "Large",
+})
+
+# システムおよび開発関連ディレクトリ
+_SYSTEM_DIRECTORIES = frozenset({
+    # バージョン管理
+    ".git", ".svn", ".hg", ".bzr",
+    # Python
+    "__pycache__", ".pytest_cache", ".mypy_cache", ".tox",
+    "venv", ".venv", "env", ".env", "virtualenv",
+    # Node.js
+    "node_modules", "bower_components",
+    # その他の開発ツール
+    ".idea", ".vscode", ".vs",
+    # システムフォルダ
+    "bin", "lib", "lib64", "include", "share",
+    # macOS
+    ".DS_Store", ".Trash", ".Spotlight-V100",
+    # Windows
+    "$RECYCLE.BIN", "System Volume Information",
+    # ビルド成果物
+    "build", "dist", "target", "out",
+    # キャッシュ
+    ".cache", "cache", "tmp", "temp",
+})
+
+# ディレクトリをファイル記述子で走査できるか（POSIX、DirEntry.stat()がfstatatになる）
+_SCANDIR_BY_FD = os.scandir in os.supports_fd and hasattr(os, 'O_DIRECTORY')
+
+# 走査のためにディレクトリを開く際のフラグ
+_DIRECTORY_OPEN_FLAGS = os.O_RDONLY | getattr(os, 'O_DIRECTORY', 0) | getattr(os, 'O_CLOEXEC', 0)
+
+# まとめて記録するログの件数（これを超えたらロガーに渡す）
+_LOG_FLUSH_THRESHOLD = 1024
+
+# 走査と実行を並行させる場合に先行して生成するアクションの上限
+_PIPELINE_QUEUE_SIZE = 4096
+
+# 走査スレッドから実行側にまとめて渡すアクションの件数
+_PIPELINE_BATCH_SIZE = 64
+
+# 走査の終了を表す番兵
+_END_OF_ACTIONS = object()
+
+# カーネル内コピー1回あたりの最大バイト数
+_KERNEL_COPY_CHUNK = 64 * 1024 * 1024
+
+# ユーザー空間でコピーする場合のバッファサイズ
+_USERSPACE_COPY_BUFSIZE = 1024 * 1024
+
+# カーネル内コピーが使えない場合に返されるエラー
+_KERNEL_COPY_UNSUPPORTED = {
+    errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP,
+    errno.EPERM, errno.EBADF, errno.ENOTSUP,
+}
+
+
+def _compile_custom_patterns(patterns: Optional[Iterable[str]]) -> Optional[Pattern]:
+    """
+    カスタム除外パターンを部分一致で判定する1つの正規表現にコンパイル
+
+    Args:
+        patterns: カスタム除外パターンのリスト（正規表現ではなく文字列として扱う）
+
+    Returns:
+        コンパイル済みパターン（パターンがない場合None）
+    """
+    if not patterns:
+        return None
+    return re.compile("|".join(map(re.escape, patterns)))
+
+
+def _paths_overlap(path: str, other: str) -> bool:
+    """
+    2つのディレクトリが同じか、一方が他方の内側にあるかを判定
+
+    Args:
+        path: ディレクトリのパス
+        other: ディレクトリのパス
+
+    Returns:
+        重なる場合True
+    """
+    path = os.path.realpath(path)
+    other = os.path.realpath(other)
+    try:
+        common = os.path.commonpath([path, other])
+    except ValueError:
+        # Windowsで異なるドライブの場合
+        return False
+    return common == path or common == other
+
+
+def _kernel_copy(copy_chunk: Callable[[int], int], offset: int, size: int) -> int:
+    """
+    カーネル内コピーの関数を終端まで繰り返し呼び出す
+
+    Args:
+        copy_chunk: 読み込み位置を受け取りコピーしたバイト数を返す関数
+        offset: コピーを開始する位置
+        size: ファイルサイズ
+
+    Returns:
+        コピーが完了した位置（未対応のエラーで中断した場合はその時点の位置）
+    """
+    try:
+        while offset < size:
+            copied = copy_chunk(offset)
+            if copied == 0:
+                # ファイルシステムによっては未対応時に0を返すため、残りは別の方法でコピー
+                break
+            offset += copied
+    except OSError as e:
+        if e.errno not in _KERNEL_COPY_UNSUPPORTED:
+            raise
+
+    return offset
+
+
+def _fast_copy2(source: str, destination: str) -> None:
+    """
+    メタデータを保持してファイルをコピー（shutil.copy2相当、既存ファイルは上書きしない）
+
+    Linuxでは os.copy_file_range（reflink・サーバー側コピー）、次に os.sendfile を使い、
+    データをユーザー空間に読み込まずにコピーする。どちらも使えない場合は
+    1MiBのバッファでコピーする。その他のOSでは shutil.copy2 がOS固有の
+    高速コピーを使用するためそのまま委ねる。
+
+    Args:
+        source: コピー元のパス
+        destination: コピー先のパス
+
+    Raises:
+        FileExistsError: コピー先が既に存在する場合
+    """
+    if not hasattr(os, 'copy_file_range') and not hasattr(os, 'sendfile'):
+        if os.path.lexists(destination):
+            raise FileExistsError(errno.EEXIST, "ファイルが既に存在します", destination)
+        shutil.copy2(source, destination)
+        return
+
+    # 'x' モードで開き、既存ファイルを上書きしない（存在する場合はFileExistsError）
+    with open(source, 'rb') as fsrc, open(destination, 'xb') as fdst:
+        src_fd = fsrc.fileno()
+        dst_fd = fdst.fileno()
+        size = os.fstat(src_fd).st_size
+        offset = 0
+
+        if hasattr(os, 'copy_file_range'):
+            offset = _kernel_copy(
+                lambda pos: os.copy_file_range(src_fd, dst_fd, _KERNEL_COPY_CHUNK, pos, pos),
+                offset, size)
+
+        if offset < size and hasattr(os, 'sendfile'):
+            # sendfileはコピー先の現在位置に書き込むため位置を合わせる
+            os.lseek(dst_fd, offset, os.SEEK_SET)
+            offset = _kernel_copy(
+                lambda pos: os.sendfile(dst_fd, src_fd, pos, _KERNEL_COPY_CHUNK),
+                offset, size)
+
+        if offset < size:
+            # ユーザー空間でのコピー
+            fsrc.seek(offset)
+            fdst.seek(offset)
+            shutil.copyfileobj(fsrc, fdst, _USERSPACE_COPY_BUFSIZE)
+
+    shutil.copystat(source, destination)
+
+
+def _load_renameat2() -> Optional[Callable[..., int]]:
+    """
+    libcのrenameat2()を取得（Linux以外、またはglibc 2.28未満の場合はNone）
+    """
+    if not sys.platform.startswith('linux'):
+        return None
+
+    try:
+        func = ctypes.CDLL(None, use_errno=True).renameat2
+    except (OSError, AttributeError):
+        return None
+
+    func.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_int, ctypes.c_char_p, ctypes.c_uint]
+    func.restype = ctypes.c_int
+    return func
+
+
+_RENAMEAT2 = _load_renameat2()
+_AT_FDCWD = -100
+_RENAME_NOREPLACE = 1
+
+
+def _rename_no_replace(source: str, destination: str) -> bool:
+    """
+    既存ファイルを上書きせずに名前を変更（renameat2 の RENAME_NOREPLACE）
+
+    ハードリンクと異なり1回の操作で移動するため、フォルダ監視などには
+    作成ではなく移動として通知される。
+
+    Args:
+        source: 移動元のパス
+        destination: 移動先のパス
+
+    Returns:
+        移動した場合True、renameat2やフラグが使えない場合False
+
+    Raises:
+        FileExistsError: 移動先が既に存在する場合
+        OSError: その他のエラー（別デバイスの場合はEXDEV）
+    """
+    if _RENAMEAT2 is None:
+        return False
+
+    if _RENAMEAT2(_AT_FDCWD, os.fsencode(source), _AT_FDCWD, os.fsencode(destination), _RENAME_NOREPLACE) == 0:
+        return True
+
+    error = ctypes.get_errno()
+    if error in (errno.EINVAL, errno.ENOSYS):
+        # カーネルまたはファイルシステムがフラグに対応していない
+        return False
+    raise OSError(error, os.strerror(error), source, None, destination)
+
+
+def _move_no_replace(source: str, destination: str) -> None:
+    """
+    既存ファイルを上書きせずにファイルを移動
+
+    存在確認と移動を別々に行うと確認後に作成されたファイルを上書きしてしまうため、
+    Linuxでは renameat2(RENAME_NOREPLACE) で移動する。
+    Linux以外のPOSIX、およびファイルシステムが RENAME_NOREPLACE に対応せず
+    EINVAL を返す場合（カーネルが未対応で ENOSYS の場合も含む）は、
+    ハードリンクの作成（既存の場合は失敗する）とリンク解除で移動する。
+    この経路はフォルダ監視には移動ではなく移動先での作成として通知される。
+    Windowsの os.rename は既存ファイルがあると失敗するためそのまま使用する。
+    どちらも使えない場合（別デバイスなど）はコピーと削除で移動する。
+
+    Args:
+        source: 移動元のパス
+        destination: 移動先のパス
+
+    Raises:
+        FileExistsError: 移動先が既に存在する場合
+    """
+    try:
+        if os.name == 'nt':
+            os.rename(source, destination)
+        elif not _rename_no_replace(source, destination):
+            os.link(source, destination, follow_symlinks=False)
+            os.unlink(source)
+        return
+    except (FileExistsError, FileNotFoundError):
+        raise
+    except OSError:
+        # 別デバイス、またはハードリンク非対応のファイルシステム
+        pass
+
+    if os.path.lexists(destination):
+        raise FileExistsError(errno.EEXIST, "ファイルが既に存在します", destination)
+
+    if os.path.islink(source):
+        # シンボリックリンクはリンクのまま移動させる
+        shutil.move(source, destination)
+        return
+
+    _fast_copy2(source, destination)
+    os.unlink(source)
+
 
 class FileOrganizer:
     """ファイル整理を実行するクラス"""
@@ -20,6 +302,7 @@ class FileOrganizer:
         """
         self.rule_engine = RuleEngine()
         self.logger = logger or OperationLogger()
+        self._log_lock = threading.Lock()  # ワーカースレッド間でログ記録を保護
 
     def organize(self, source_dir: str, rules: Dict,
                 output_dir: Optional[str] = None,
@@ -38,58 +321,147 @@ class FileOrganizer:
         Returns:
             アクションリストの辞書のリスト
         """
+        return list(self.iter_actions(source_dir, rules, output_dir,
+                                      preview_mode=preview_mode,
+                                      operation_mode=operation_mode))
+
+    def iter_actions(self, source_dir: str, rules: Dict,
+                     output_dir: Optional[str] = None,
+                     preview_mode: bool = False,
+                     operation_mode: str = 'move',
+                     recursive: bool = True) -> Iterator[Dict[str, Any]]:
+        """
+        ディレクトリを走査しながらアクションを1件ずつ生成
+
+        すべてのアクションをリストに保持する必要がない場合（件数の集計や
+        条件での絞り込みなど）は organize() の代わりに使用する。
+
+        Args:
+            source_dir: 整理対象のディレクトリ
+            rules: 適用するルール辞書
+            output_dir: 整理先のディレクトリ（Noneの場合はsource_dir内で整理）
+            preview_mode: Trueの場合は実行せずにプレビューのみ
+            operation_mode: 'move' (移動) または 'copy' (コピー)
+            recursive: サブディレクトリのファイルも対象にするか
+
+        Yields:
+            アクションの辞書
+        """
         if output_dir is None:
             output_dir = source_dir
 
-        actions = []
-
         # ルールからカスタム除外パターンを取得
         custom_exclude_patterns = rules.get('exclude_patterns', [])
 
         try:
+            # ルールの解釈や正規表現のコンパイルは走査前に1回だけ行う
+            compiled_rules = self.rule_engine.compile_rules(rules)
+
             # ソースディレクトリ内のすべてのファイルを取得
-            for root, dirs, files in os.walk(source_dir):
-                # 除外すべきディレクトリをフィルタリング
-                if root != source_dir:
-                    if self._should_exclude_directory(root, custom_exclude_patterns):
-                        dirs.clear()  # サブディレクトリの探索を停止
-                        continue
-
-                for filename in files:
-                    source_path = os.path.join(root, filename)
-
-                    # ルールを適用して目的地を決定
-                    destination_path = self.rule_engine.apply_rules(
-                        source_path,
-                        rules,
-                        output_dir
-                    )
+            for source_path, filename, stat_result in self._iter_files(source_dir, custom_exclude_patterns, recursive):
+                # ルールを適用して目的地を決定（走査時のstat情報を再利用）
+                destination_path = self.rule_engine.apply_compiled(
+                    source_path,
+                    compiled_rules,
+                    stat_result,
+                    output_dir
+                )
 
-                    if destination_path and destination_path != source_path:
-                        actions.append({
-                            "type": operation_mode,
-                            "source": source_path,
-                            "destination": destination_path,
-                            "filename": filename,
-                            "size": os.path.getsize(source_path),
-                            "status": "pending"
-                        })
+                if destination_path and destination_path != source_path:
+                    yield {
+                        "type": operation_mode,
+                        "source": source_path,
+                        "destination": destination_path,
+                        "filename": filename,
+                        "size": stat_result.st_size,
+                        "status": "pending"
+                    }
 
         except Exception as e:
             print(f"エラー: ファイル整理中にエラーが発生しました: {e}")
 
-        return actions
+    def _iter_files(self, source_dir: str,
+                    custom_exclude_patterns: Optional[List[str]] = None,
+                    recursive: bool = True) -> Iterator[Tuple[str, str, os.stat_result]]:
+        """
+        os.scandir()でディレクトリを走査してファイルを列挙
+
+        os.walk()と同じ順序（各ディレクトリのファイルの後にサブディレクトリを深さ優先）で
+        列挙し、stat情報はDirEntryにキャッシュされたものを返す。
+        POSIXではディレクトリをファイル記述子で開いて走査するため、各ファイルのstatは
+        フルパスではなくディレクトリからの相対名で解決される（fstatat）。
+
+        Args:
+            source_dir: 走査するディレクトリ
+            custom_exclude_patterns: カスタム除外パターンのリスト
+            recursive: サブディレクトリも走査するか
+
+        Yields:
+            (ファイルパス, ファイル名, stat情報) のタプル
+        """
+        custom_pattern = _compile_custom_patterns(custom_exclude_patterns)
+        # 同じディレクトリ名は何度も現れるため、判定結果を名前ごとに記憶
+        excluded_names = {}
+        stack = deque([source_dir])
+
+        while stack:
+            directory = stack.pop()
+            # os.path.join(directory, name) と同じパスを連結だけで作るための接頭辞
+            prefix = os.path.join(directory, '')
+            subdirs = []
+            dir_fd = None
 
-    def execute_actions(self, actions: List[Dict[str, Any]],
+            try:
+                if _SCANDIR_BY_FD:
+                    dir_fd = os.open(directory, _DIRECTORY_OPEN_FLAGS)
+                    it = os.scandir(dir_fd)
+                else:
+                    it = os.scandir(directory)
+
+                with it:
+                    for entry in it:
+                        try:
+                            if entry.is_dir(follow_symlinks=False):
+                                if not recursive:
+                                    continue
+                                # 除外すべきディレクトリは探索しない
+                                excluded = excluded_names.get(entry.name)
+                                if excluded is None:
+                                    excluded = self._should_exclude_directory(prefix + entry.name, custom_pattern)
+                                    excluded_names[entry.name] = excluded
+                                if not excluded:
+                                    subdirs.append(prefix + entry.name)
+                            elif entry.is_file():
+                                yield prefix + entry.name, entry.name, entry.stat()
+                        except OSError:
+                            # 読み込み中に削除されたファイルなどはスキップ
+                            continue
+            except OSError:
+                # os.walk()と同様に読み込めないディレクトリは無視
+                continue
+            finally:
+                if dir_fd is not None:
+                    os.close(dir_fd)
+
+            # 先頭のサブディレクトリから処理されるよう逆順に積む
+            stack.extend(reversed(subdirs))
+
+    def execute_actions(self, actions: Iterable[Dict[str, Any]],
                        callback: Optional[Callable[[int, int, str], None]] = None,
-                       skip_existing: bool = True) -> Dict[str, Any]:
+                       skip_existing: bool = True,
+                       max_workers: Optional[int] = None) -> Dict[str, Any]:
         """
         アクションリストを実行
 
+        移動・コピーはI/O待ちが中心のため、移動先ディレクトリごとにまとめて
+        スレッドプールで並列に実行する。同じディレクトリへのアクションは
+        同じスレッドで順に実行されるため、既存ファイルの判定や連番の付与が競合しない。
+
         Args:
-            actions: organize()で生成されたアクションリスト
+            actions: organize()で生成されたアクションリスト（iter_actions()のジェネレータも可）
             callback: 進捗コールバック関数 (current, total, message)
             skip_existing: 既存のファイルをスキップするか
+            max_workers: 並列ワーカー数（Noneの場合はCPU数に応じて決定）
 
         Returns:
             実行結果の統計情報
@@ -97,90 +469,367 @@ class FileOrganizer:
         # 操作を開始
         operation_id = self.logger.start_operation()
 
+        if max_workers is None:
+            max_workers = DEFAULT_IO_WORKERS
+
+        # 移動先ディレクトリごとにグループ化（ジェネレータはここで1回だけ消費する）
+        if not isinstance(actions, list):
+            actions = list(actions)
         total = len(actions)
-        successful = 0
-        failed = 0
-        skipped = 0
 
-        for i, action in enumerate(actions, 1):
-            action_type = action["type"]
-            source = action["source"]
-            destination = action["destination"]
+        groups = defaultdict(list)
+        for action in actions:
+            groups[os.path.dirname(action["destination"])].append(action)
+
+        progress_lock = threading.Lock()
+        progress = 0
 
-            # コールバック実行
-            if callback:
-                callback(i, total, f"処理中: {action['filename']}")
+        # 作成済みのディレクトリ（同じディレクトリへのmakedirsの繰り返しを省略）
+        created_dirs = set()
+
+        def run_group(group: List[Dict[str, Any]]) -> Counter:
+            nonlocal progress
+            counts = Counter()
+            pending_logs = []
 
             try:
-                # 既存ファイルのチェック
-                if os.path.exists(destination):
-                    if skip_existing:
-                        action["status"] = "skipped"
-                        action["reason"] = "ファイルが既に存在します"
-                        skipped += 1
-                        self.logger.log_action(
-                            action_type, source, destination,
-                            status="skipped",
-                            metadata={"reason": "ファイルが既に存在します"}
-                        )
-                        continue
-                    else:
-                        # 既存ファイルに番号を付けて回避
-                        destination = self._get_unique_filename(destination)
-                        action["destination"] = destination
+                for action in group:
+                    # コールバック実行
+                    if callback:
+                        with progress_lock:
+                            progress += 1
+                            callback(progress, total, f"処理中: {action['filename']}")
+
+                    counts[self._execute_action(action, skip_existing, created_dirs, pending_logs)] += 1
+
+                    # ロックの取得を減らすため、ログはある程度まとめてから記録
+                    if len(pending_logs) >= _LOG_FLUSH_THRESHOLD:
+                        self._flush_logs(pending_logs)
+            finally:
+                # 途中で例外が発生しても実行済みのアクションは記録する
+                self._flush_logs(pending_logs)
+
+            return counts
+
+        totals = Counter()
+        if max_workers <= 1 or len(groups) <= 1:
+            for group in groups.values():
+                totals.update(run_group(group))
+        else:
+            with ThreadPoolExecutor(max_workers=min(max_workers, len(groups))) as executor:
+                for counts in executor.map(run_group, groups.values()):
+                    totals.update(counts)
 
-                # ディレクトリ作成
-                dest_dir = os.path.dirname(destination)
-                os.makedirs(dest_dir, exist_ok=True)
+        # ログ保存
+        log_path = self.logger.save_log(operation_name="File Organization")
 
-                # ファイル操作の実行
-                if action_type == "move":
-                    shutil.move(source, destination)
-                elif action_type == "copy":
-                    shutil.copy2(source, destination)
-                else:
-                    raise ValueError(f"不明な操作タイプ: {action_type}")
-
-                action["status"] = "success"
-                successful += 1
-
-                # ログ記録
-                self.logger.log_action(action_type, source, destination, status="success")
-
-            except PermissionError as e:
-                action["status"] = "failed"
-                action["error"] = f"アクセス権限がありません: {e}"
-                failed += 1
-                self.logger.log_action(
-                    action_type, source, destination,
-                    status="failed",
-                    metadata={"error": str(e)}
-                )
+        # 結果を返す
+        return {
+            "operation_id": operation_id,
+            "log_path": log_path,
+            "total_actions": total,
+            "successful": totals["success"],
+            "failed": totals["failed"],
+            "skipped": totals["skipped"],
+            "actions": actions
+        }
 
-            except Exception as e:
-                action["status"] = "failed"
-                action["error"] = str(e)
-                failed += 1
-                self.logger.log_action(
-                    action_type, source, destination,
-                    status="failed",
-                    metadata={"error": str(e)}
-                )
+    def organize_and_execute(self, source_dir: str, rules: Dict,
+                             output_dir: Optional[str] = None,
+                             operation_mode: str = 'move',
+                             callback: Optional[Callable[[int, int, str], None]] = None,
+                             skip_existing: bool = True,
+                             max_workers: Optional[int] = None) -> Dict[str, Any]:
+        """
+        ディレクトリの走査・分類と移動・コピーを並行して実行
+
+        走査と分類をバックグラウンドのスレッドで行い、生成されたアクションを
+        上限付きのキューを介して順次スレッドプールで実行する。走査のstatと
+        ファイル操作のI/O待ちが重なるため、organize()の後にexecute_actions()を
+        呼び出すより早く完了する。同じ移動先ディレクトリへのアクションは
+        execute_actions()と同様に生成順に1つずつ実行される。
+
+        整理先が整理対象のディレクトリと重なる場合は、作成中のディレクトリを
+        走査してしまわないよう organize() の完了後に execute_actions() を実行する。
+
+        Args:
+            source_dir: 整理対象のディレクトリ
+            rules: 適用するルール辞書
+            output_dir: 整理先のディレクトリ（Noneの場合はsource_dir内で整理）
+            operation_mode: 'move' (移動) または 'copy' (コピー)
+            callback: 進捗コールバック関数 (current, total, message)。
+                     totalは走査が終わるまでその時点で見つかった件数
+            skip_existing: 既存のファイルをスキップするか
+            max_workers: 並列ワーカー数（Noneの場合はCPU数に応じて決定）
+
+        Returns:
+            実行結果の統計情報（execute_actions()と同じ形式）
+        """
+        if output_dir is None:
+            output_dir = source_dir
+
+        if _paths_overlap(source_dir, output_dir):
+            actions = self.organize(source_dir, rules, output_dir, operation_mode=operation_mode)
+            return self.execute_actions(actions, callback, skip_existing, max_workers)
+
+        if max_workers is None:
+            max_workers = DEFAULT_IO_WORKERS
+        max_workers = max(1, max_workers)
+
+        # 操作を開始
+        operation_id = self.logger.start_operation()
+
+        action_queue = queue.Queue(maxsize=_PIPELINE_QUEUE_SIZE // _PIPELINE_BATCH_SIZE)
+        stop = threading.Event()
+
+        def put(batch: List[Dict[str, Any]]) -> bool:
+            # 実行側が停止した場合に待ち続けないよう、タイムアウト付きで停止を確認
+            while not stop.is_set():
+                try:
+                    action_queue.put(batch, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def produce() -> None:
+            # キューの受け渡しの回数を減らすため、アクションはまとめて渡す
+            batch = []
+            try:
+                for action in self.iter_actions(source_dir, rules, output_dir,
+                                                 operation_mode=operation_mode):
+                    batch.append(action)
+                    if len(batch) >= _PIPELINE_BATCH_SIZE:
+                        if not put(batch):
+                            return
+                        batch = []
+                if batch:
+                    put(batch)
+            except BaseException as e:
+                # 走査中のエラーは呼び出し元で送出する（実行済みの結果を成功として返さない）
+                with state_lock:
+                    errors.append(e)
+                stop.set()
+            finally:
+                action_queue.put(_END_OF_ACTIONS)
+
+        # 実行中・実行待ちのアクション数を制限（走査が先行しすぎないようにする）
+        in_flight = threading.BoundedSemaphore(_PIPELINE_QUEUE_SIZE)
+        state_lock = threading.Lock()
+        pending = {}  # 移動先ディレクトリ: 実行待ちのアクション
+        totals = Counter()
+        errors = []
+        created_dirs = set()
+        actions = []
+        progress = 0
+
+        def drain(dest_dir: str) -> None:
+            nonlocal progress
+            counts = Counter()
+            pending_logs = []
+
+            try:
+                while True:
+                    with state_lock:
+                        group = pending[dest_dir]
+                        if not group:
+                            del pending[dest_dir]
+                            return
+                        action = group.popleft()
+                        progress += 1
+                        if callback:
+                            callback(progress, len(actions), f"処理中: {action['filename']}")
+
+                    try:
+                        counts[self._execute_action(action, skip_existing, created_dirs, pending_logs)] += 1
+                    finally:
+                        in_flight.release()
+
+                    # ロックの取得を減らすため、ログはある程度まとめてから記録
+                    if len(pending_logs) >= _LOG_FLUSH_THRESHOLD:
+                        self._flush_logs(pending_logs)
+
+            except BaseException as e:
+                # 残りのアクションは実行せず、ディスパッチを停止する
+                with state_lock:
+                    errors.append(e)
+                    for _ in pending.pop(dest_dir, ()):
+                        in_flight.release()
+                stop.set()
+                raise
+
+            finally:
+                self._flush_logs(pending_logs)
+                with state_lock:
+                    totals.update(counts)
+
+        producer = threading.Thread(target=produce, name="organize-walker", daemon=True)
+        producer.start()
+
+        try:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                while True:
+                    batch = action_queue.get()
+                    if batch is _END_OF_ACTIONS:
+                        break
+
+                    for action in batch:
+                        if stop.is_set():
+                            break
+
+                        in_flight.acquire()
+                        dest_dir = os.path.dirname(action["destination"])
+                        with state_lock:
+                            actions.append(action)
+                            group = pending.get(dest_dir)
+                            if group is None:
+                                # このディレクトリを担当するワーカーがいなければ起動
+                                pending[dest_dir] = deque([action])
+                                executor.submit(drain, dest_dir)
+                            else:
+                                group.append(action)
+        finally:
+            # 中断された場合も走査スレッドを終了させる
+            stop.set()
+            # 実行側が例外で抜けた場合も終了マーカーを渡せるよう、走査スレッドの終了までキューを空ける
+            while producer.is_alive():
+                try:
+                    action_queue.get(timeout=0.1)
+                except queue.Empty:
+                    pass
+
+        producer.join()
 
         # ログ保存
         log_path = self.logger.save_log(operation_name="File Organization")
 
+        if errors:
+            raise errors[0]
+
         # 結果を返す
         return {
             "operation_id": operation_id,
             "log_path": log_path,
-            "total_actions": total,
-            "successful": successful,
-            "failed": failed,
-            "skipped": skipped,
+            "total_actions": len(actions),
+            "successful": totals["success"],
+            "failed": totals["failed"],
+            "skipped": totals["skipped"],
             "actions": actions
         }
 
+    def _execute_action(self, action: Dict[str, Any], skip_existing: bool,
+                        created_dirs: Optional[set] = None,
+                        pending_logs: Optional[List[Tuple]] = None) -> str:
+        """
+        個別のアクションを実行してログに記録
+
+        Args:
+            action: 実行するアクション
+            skip_existing: 既存のファイルをスキップするか
+            created_dirs: 作成済みのディレクトリの集合（指定した場合は作成後に追加される）
+            pending_logs: ログの記録先（指定した場合は追加のみ行い、_flush_logs()で記録する）
+
+        Returns:
+            実行結果のステータス（success, failed, skipped）
+        """
+        action_type = action["type"]
+        source = action["source"]
+        destination = action["destination"]
+
+        try:
+            if action_type not in ("move", "copy"):
+                raise ValueError(f"不明な操作タイプ: {action_type}")
+
+            # ディレクトリ作成
+            # （移動先ディレクトリごとに1つのワーカーが担当するため、集合の判定と追加は
+            # 競合しない。祖先ディレクトリの同時作成はexist_okで吸収される）
+            dest_dir = os.path.dirname(destination)
+            if created_dirs is None or dest_dir not in created_dirs:
+                os.makedirs(dest_dir, exist_ok=True)
+                if created_dirs is not None:
+                    created_dirs.add(dest_dir)
+
+            # ファイル操作の実行（既存ファイルは事前に確認せず、作成時の失敗で検出する）
+            while True:
+                try:
+                    if action_type == "move":
+                        _move_no_replace(source, destination)
+                    else:
+                        _fast_copy2(source, destination)
+                    break
+                except FileExistsError:
+                    if skip_existing:
+                        action["status"] = "skipped"
+                        action["reason"] = "ファイルが既に存在します"
+                        self._log_action(
+                            pending_logs, action_type, source, destination,
+                            status="skipped",
+                            metadata={"reason": "ファイルが既に存在します"}
+                        )
+                        return "skipped"
+
+                    # 既存ファイルに番号を付けて回避
+                    destination = self._get_unique_filename(destination)
+                    action["destination"] = destination
+
+            action["status"] = "success"
+
+            # ログ記録
+            self._log_action(pending_logs, action_type, source, destination, status="success")
+            return "success"
+
+        except PermissionError as e:
+            action["status"] = "failed"
+            action["error"] = f"アクセス権限がありません: {e}"
+            self._log_action(
+                pending_logs, action_type, source, destination,
+                status="failed",
+                metadata={"error": str(e)}
+            )
+            return "failed"
+
+        except Exception as e:
+            action["status"] = "failed"
+            action["error"] = str(e)
+            self._log_action(
+                pending_logs, action_type, source, destination,
+                status="failed",
+                metadata={"error": str(e)}
+            )
+            return "failed"
+
+    def _log_action(self, pending_logs: Optional[List[Tuple]], action_type: str,
+                    source: str, destination: str, status: str = "success",
+                    metadata: Optional[Dict[str, Any]] = None) -> None:
+        """
+        アクションをログに記録（pending_logsを指定した場合はそこに追加）
+
+        Args:
+            pending_logs: まとめて記録するためのリスト（Noneの場合はすぐに記録）
+            action_type: アクションの種類
+            source: 元のファイルパス
+            destination: 移動先のファイルパス
+            status: 実行結果
+            metadata: 追加のメタデータ
+        """
+        if pending_logs is not None:
+            pending_logs.append((action_type, source, destination, status, metadata,
+                                 datetime.now().isoformat()))
+            return
+
+        with self._log_lock:
+            self.logger.log_action(action_type, source, destination,
+                                   status=status, metadata=metadata)
+
+    def _flush_logs(self, pending_logs: List[Tuple]) -> None:
+        """まとめたログをワーカースレッドから安全に記録して空にする"""
+        if not pending_logs:
+            return
+
+        with self._log_lock:
+            self.logger.log_actions_bulk(pending_logs)
+        pending_logs.clear()
+
     def undo(self, log_file: str,
             callback: Optional[Callable[[int, int, str], None]] = None) -> bool:
         """
@@ -269,31 +918,28 @@ class FileOrganizer:
         """
         空のディレクトリを再帰的に削除
 
+        空かどうかを事前に確認せず os.rmdir() を試み、空でない・存在しない
+        などで失敗した時点で終了する（1ディレクトリにつき1回のシステムコール）。
+
         Args:
             start_path: 開始ディレクトリのパス
         """
         try:
-            # ディレクトリが存在するか確認
-            if not os.path.exists(start_path) or not os.path.isdir(start_path):
-                return
-
-            # ディレクトリが空かチェック
-            while os.path.exists(start_path) and os.path.isdir(start_path):
+            while start_path:
                 try:
-                    # サブディレクトリやファイルがあるかチェック
-                    if not os.listdir(start_path):
-                        # 空なら削除
-                        os.rmdir(start_path)
-                        print(f"空のディレクトリを削除: {start_path}")
-                        # 親ディレクトリも空かチェック
-                        start_path = os.path.dirname(start_path)
-                    else:
-                        # 空でない場合は終了
-                        break
+                    os.rmdir(start_path)
                 except OSError:
-                    # 削除できない場合は終了
+                    # 空でない、存在しない、またはディレクトリでない場合は終了
                     break
 
+                print(f"空のディレクトリを削除: {start_path}")
+
+                # 親ディレクトリも空かチェック
+                parent = os.path.dirname(start_path)
+                if parent == start_path:
+                    break
+                start_path = parent
+
         except Exception as e:
             print(f"警告: ディレクトリ削除中にエラーが発生しました: {e}")
 
@@ -326,83 +972,43 @@ class FileOrganizer:
             統計情報の辞書
         """
         total_size = sum(action.get("size", 0) for action in actions)
-        by_type = {}
-        by_status = {}
-
-        for action in actions:
-            # タイプ別
-            action_type = action.get("type", "unknown")
-            by_type[action_type] = by_type.get(action_type, 0) + 1
 
-            # ステータス別
-            status = action.get("status", "pending")
-            by_status[status] = by_status.get(status, 0) + 1
+        # タイプ別・ステータス別（Counterの集計はC実装で行われる）
+        by_type = dict(Counter(action.get("type", "unknown") for action in actions))
+        by_status = dict(Counter(action.get("status", "pending") for action in actions))
 
         return {
             "total_actions": len(actions),
             "total_size": total_size,
-            "total_size_formatted": self._format_size(total_size),
+            "total_size_formatted": format_size(total_size),
             "by_type": by_type,
             "by_status": by_status
         }
 
-    def _should_exclude_directory(self, path: str, custom_patterns: List[str] = None) -> bool:
+    def _should_exclude_directory(self, path: str, custom_pattern: Optional[Pattern] = None) -> bool:
         """
         ディレクトリを除外すべきかどうかを判定
 
         Args:
             path: ディレクトリのパス
-            custom_patterns: カスタム除外パターンのリスト
+            custom_pattern: _compile_custom_patterns()でコンパイルしたカスタム除外パターン
 
         Returns:
             除外すべき場合True
         """
         dirname = os.path.basename(path)
 
-        # デフォルトの除外パターン
-        # 1. 整理カテゴリディレクトリ（このツールが作成するディレクトリ）
-        organized_patterns = [
-            "Images", "Videos", "Documents", "Audio", "Archives",
-            "Code", "Others", "Small", "Medium", "Large"
-        ]
-
-        # 2. システムおよび開発関連ディレクトリ
-        system_patterns = [
-            # バージョン管理
-            ".git", ".svn", ".hg", ".bzr",
-            # Python
-            "__pycache__", ".pytest_cache", ".mypy_cache", ".tox",
-            "venv", ".venv", "env", ".env", "virtualenv",
-            # Node.js
-            "node_modules", "bower_components",
-            # その他の開発ツール
-            ".idea", ".vscode", ".vs",
-            # システムフォルダ
-            "bin", "lib", "lib64", "include", "share",
-            # macOS
-            ".DS_Store", ".Trash", ".Spotlight-V100",
-            # Windows
-            "$RECYCLE.BIN", "System Volume Information",
-            # ビルド成果物
-            "build", "dist", "target", "out",
-            # キャッシュ
-            ".cache", "cache", "tmp", "temp",
-        ]
-
-        # 3. 隠しディレクトリ（.で始まる）
+        # 1. 隠しディレクトリ（.で始まる）
         if dirname.startswith('.'):
             return True
 
-        # 4. デフォルトパターンに一致するか
-        if dirname in organized_patterns or dirname in system_patterns:
+        # 2. デフォルトパターンに一致するか
+        if dirname in _ORGANIZED_DIRECTORIES or dirname in _SYSTEM_DIRECTORIES:
             return True
 
-        # 5. カスタムパターンに一致するか
-        if custom_patterns:
-            for pattern in custom_patterns:
-                # 完全一致または部分一致（簡易的なパターンマッチング）
-                if pattern in dirname or dirname == pattern:
-                    return True
+        # 3. カスタムパターンに一致するか（部分一致）
+        if custom_pattern is not None and custom_pattern.search(dirname):
+            return True
 
         return False
 
@@ -427,14 +1033,3 @@ class FileOrganizer:
             counter += 1
 
         return file_path
-
-    @staticmethod
-    def _format_size(size_bytes: int) -> str:
-        """
-        バイト数を人間が読みやすい形式に変換
-        """
-        for unit in ['B', 'KB', 'MB', 'GB', 'TB']:
-            if size_bytes < 1024.0:
-                return f"{size_bytes:.2f} {unit}"
-            size_bytes /= 1024.0
-        return f"{size_bytes:.2f} PB"
@@ -3,39 +3,141 @@
 整理ルールの読み込み、保存、検証、適用を管理
 """
 
+import copy
 import json
 import os
-from typing import Dict, List, Optional, Tuple, Any
-from .classifier import FileClassifier
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, List, Optional, Pattern, Tuple, Any
+from config import settings
+from .classifier import FileClassifier, lower_extension
+
+# 高速なJSONライブラリ（任意の依存関係、未インストール時は標準のjsonを使用）
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _read_json(path: str) -> Any:
+    """
+    JSONファイルを読み込む（orjsonがあれば使用）
+
+    Args:
+        path: ファイルのパス
+
+    Returns:
+        読み込んだデータ（不正な形式の場合はjson.JSONDecodeError）
+    """
+    if orjson is not None:
+        # orjson.JSONDecodeError は json.JSONDecodeError のサブクラス
+        with open(path, 'rb') as f:
+            return orjson.loads(f.read())
+
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _write_json(data: Any, path: str) -> None:
+    """
+    データをインデント付きのUTF-8のJSONとして書き込む（orjsonがあれば使用）
+
+    Args:
+        data: 書き込むデータ
+        path: ファイルのパス
+    """
+    if orjson is not None:
+        with open(path, 'wb') as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+        return
+
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+
+
+@dataclass
+class CompiledRules:
+    """
+    compile_rules()で前処理したルールセット
+
+    ファイルごとにルール辞書を解釈し直さずに済むよう、拡張子の逆引き辞書や
+    結合済みの正規表現を保持する。分類に使われないタイプは無効（None/False）になる。
+    """
+    priority: List[str]
+    use_extension: bool = False
+    ext_map: Dict[str, str] = field(default_factory=dict)
+    date_mode: Optional[str] = None
+    date_fmt: Optional[str] = None
+    size_thresholds: Optional[Tuple[List[int], List[str]]] = None
+    pattern_re: Optional[Pattern] = None
+    pattern_categories: List[str] = field(default_factory=list)
+    # 結合できないパターン（番号付き後方参照など）を個別に照合する場合の (カテゴリ名, パターン)
+    pattern_items: List[Tuple[str, str]] = field(default_factory=list)
+
+    @property
+    def needs_stat(self) -> bool:
+        """日付・サイズの判定にstat情報が必要か"""
+        return self.date_fmt is not None or self.size_thresholds is not None
 
 
 class RuleEngine:
     """整理ルールを管理するクラス"""
 
-    def __init__(self, rules_dir: str = "data/rules"):
+    def __init__(self, rules_dir: Optional[str] = None):
         """
         Args:
-            rules_dir: ルールファイルを保存するディレクトリ
+            rules_dir: ルールファイルを保存するディレクトリ（Noneの場合は settings.RULES_DIR）
         """
+        if rules_dir is None:
+            rules_dir = settings.get_rules_dir()
+        else:
+            # ルールディレクトリが存在しない場合は作成
+            os.makedirs(rules_dir, exist_ok=True)
+
         self.rules_dir = rules_dir
         self.classifier = FileClassifier()
 
-        # ルールディレクトリが存在しない場合は作成
-        os.makedirs(self.rules_dir, exist_ok=True)
+        # 読み込み済みルールのキャッシュ（パス: (更新時刻ns, サイズ, ルールデータ)）
+        self._rule_cache: Dict[str, Tuple[int, int, Dict]] = {}
 
     def load_rules(self, rule_path: str) -> Optional[Dict]:
         """
         ルールファイルを読み込む
 
+        ファイルの更新時刻とサイズが前回の読み込み時と同じ場合はキャッシュを使用する。
+
         Args:
             rule_path: ルールファイルのパス
 
         Returns:
-            ルールデータの辞書。エラー時はNone
+            ルールデータの辞書（呼び出し側で変更してよいコピー）。エラー時はNone
+        """
+        rules = self._load_rules_cached(rule_path)
+        return copy.deepcopy(rules) if rules is not None else None
+
+    def _load_rules_cached(self, rule_path: str,
+                           stat_result: Optional[os.stat_result] = None) -> Optional[Dict]:
+        """
+        ルールファイルを読み込む（キャッシュされた辞書をそのまま返す）
+
+        Args:
+            rule_path: ルールファイルのパス
+            stat_result: 取得済みのstat情報（省略時はos.statを呼び出す）
+
+        Returns:
+            ルールデータの辞書（キャッシュと共有されるため変更しないこと）。エラー時はNone
         """
         try:
-            with open(rule_path, 'r', encoding='utf-8') as f:
-                rules = json.load(f)
+            if stat_result is None:
+                stat_result = os.stat(rule_path)
+
+            cached = self._rule_cache.get(rule_path)
+            if (cached is not None and cached[0] == stat_result.st_mtime_ns
+                    and cached[1] == stat_result.st_size):
+                return cached[2]
+
+            rules = _read_json(rule_path)
 
             # ルールの検証
             is_valid, errors = self.validate_rules(rules)
@@ -44,6 +146,7 @@ class RuleEngine:
                 for error in errors:
                     print(f"  - {error}")
 
+            self._rule_cache[rule_path] = (stat_result.st_mtime_ns, stat_result.st_size, rules)
             return rules
 
         except FileNotFoundError:
@@ -76,9 +179,9 @@ class RuleEngine:
                     print(f"  - {error}")
                 return False
 
-            # JSONとして保存
-            with open(rule_path, 'w', encoding='utf-8') as f:
-                json.dump(rules_dict, f, ensure_ascii=False, indent=2)
+            # JSONとして保存（更新時刻の分解能が粗い場合に備えてキャッシュも破棄）
+            self._rule_cache.pop(rule_path, None)
+            _write_json(rules_dict, rule_path)
 
             print(f"ルールが保存されました: {rule_path}")
             return True
@@ -151,49 +254,163 @@ class RuleEngine:
         is_valid = len(errors) == 0
         return is_valid, errors
 
-    def apply_rules(self, file_path: str, rules_dict: Dict,
-                   base_dir: str = ".") -> Optional[str]:
+    def compile_rules(self, rules_dict: Dict) -> CompiledRules:
         """
-        ファイルにルールを適用して目的地パスを取得
+        ルールセットを前処理して、ファイルごとの適用に使う形式に変換
+
+        organize()などで多数のファイルに同じルールを適用する場合は、
+        最初に1回だけ呼び出して apply_compiled() に渡す。
 
         Args:
-            file_path: ファイルのパス
             rules_dict: ルールデータの辞書
+
+        Returns:
+            前処理済みのルールセット
+        """
+        priority = list(rules_dict.get("priority", ["pattern", "extension", "date", "size"]))
+        compiled = CompiledRules(priority=priority)
+
+        category_overrides = {}
+        pattern_rules = []
+
+        for rule in rules_dict.get("rules", []):
+            rule_type = rule.get("type")
+
+            # 拡張子カテゴリは優先順位に関係なく登録（従来のadd_category()と同じ扱い）
+            if rule_type == "extension" and "categories" in rule:
+                category_overrides.update(rule["categories"])
+
+            # 目的地パスに使われない分類は前処理しない
+            if rule_type not in priority:
+                continue
+
+            # 同じタイプのルールが複数ある場合は後のルールの結果が優先される
+            if rule_type == "extension":
+                compiled.use_extension = True
+            elif rule_type == "date":
+                mode = rule.get("mode", "modified")
+                if mode not in ("created", "modified"):
+                    print(f"警告: 不明なモード '{mode}'。'modified'を使用します。")
+                    mode = "modified"
+                compiled.date_mode = mode
+                compiled.date_fmt = rule.get("format", "%Y/%m")
+            elif rule_type == "size":
+                thresholds = rule.get("thresholds")
+                if thresholds is None:
+                    thresholds = self.classifier.DEFAULT_SIZE_THRESHOLDS
+                compiled.size_thresholds = self.classifier._get_sorted_thresholds(thresholds)
+            elif rule_type == "pattern":
+                pattern_rules.append(rule.get("patterns", {}))
+
+        if compiled.use_extension:
+            compiled.ext_map = self.classifier.build_extension_index(category_overrides)
+
+        if pattern_rules:
+            # 後のルールほど優先されるため、ルールを逆順に並べて1つの選択にまとめる
+            items = [item for patterns in reversed(pattern_rules) for item in patterns.items()]
+            pattern_re, categories = self.classifier._compile_pattern_set(items)
+            if pattern_re is not None:
+                compiled.pattern_re = pattern_re
+                compiled.pattern_categories = categories
+            else:
+                compiled.pattern_items = items
+
+        return compiled
+
+    def apply_compiled(self, file_path: str, compiled: CompiledRules,
+                       stat_result: Optional[os.stat_result] = None,
+                       base_dir: str = ".") -> Optional[str]:
+        """
+        前処理済みのルールセットをファイルに適用して目的地パスを取得
+
+        Args:
+            file_path: ファイルのパス
+            compiled: compile_rules()の結果
+            stat_result: 取得済みのstat情報（省略時は必要な場合のみos.statを呼び出す）
             base_dir: 整理先のベースディレクトリ
 
         Returns:
             目的地のパス。エラー時はNone
         """
         try:
-            # 拡張子カテゴリの更新（ルールに含まれる場合）
-            for rule in rules_dict.get("rules", []):
-                if rule.get("type") == "extension" and "categories" in rule:
-                    for category, extensions in rule["categories"].items():
-                        self.classifier.add_category(category, extensions)
-
-            # ファイルを分類
-            classification = self.classifier.classify_multi(
-                file_path,
-                rules_dict.get("rules", [])
-            )
-
-            # 優先順位の取得
-            priority = rules_dict.get("priority", ["pattern", "extension", "date", "size"])
+            classification = {}
+            filename = os.path.basename(file_path)
+
+            if compiled.use_extension:
+                classification["extension"] = compiled.ext_map.get(lower_extension(filename), "Others")
+
+            if compiled.needs_stat and stat_result is None:
+                try:
+                    stat_result = os.stat(file_path)
+                except OSError as e:
+                    print(f"エラー: ファイル情報の取得に失敗しました: {file_path} - {e}")
+
+            if compiled.date_fmt is not None and stat_result is not None:
+                timestamp = (stat_result.st_ctime if compiled.date_mode == "created"
+                             else stat_result.st_mtime)
+                try:
+                    classification["date"] = datetime.fromtimestamp(timestamp).strftime(compiled.date_fmt)
+                except (OverflowError, OSError, ValueError) as e:
+                    print(f"エラー: 日付の取得に失敗しました: {file_path} - {e}")
+
+            if compiled.size_thresholds is not None:
+                if stat_result is None:
+                    classification["size"] = "Unknown"
+                else:
+                    values, names = compiled.size_thresholds
+                    index = bisect_left(values, stat_result.st_size)
+                    classification["size"] = names[index] if index < len(names) else "VeryLarge"
+
+            if compiled.pattern_re is not None:
+                match = compiled.pattern_re.match(filename)
+                if match:
+                    # 一致した代替パターンのグループ名（_p<番号>）からカテゴリを求める
+                    classification["pattern"] = compiled.pattern_categories[int(match.lastgroup[2:])]
+            elif compiled.pattern_items:
+                for category, pattern in compiled.pattern_items:
+                    regex = self.classifier._compile_pattern(pattern)
+                    if regex is not None and regex.match(filename):
+                        classification["pattern"] = category
+                        break
 
             # 目的地パスの生成
-            destination = self.classifier.get_destination_path(
+            return self.classifier.get_destination_path(
                 file_path,
                 base_dir,
                 classification,
-                priority
+                compiled.priority
             )
 
-            return destination
+        except Exception as e:
+            print(f"エラー: ルールの適用中にエラーが発生しました: {e}")
+            return None
 
+    def apply_rules(self, file_path: str, rules_dict: Dict,
+                   base_dir: str = ".", *,
+                   stat_result: Optional[os.stat_result] = None) -> Optional[str]:
+        """
+        ファイルにルールを適用して目的地パスを取得
+
+        多数のファイルに同じルールを適用する場合は compile_rules() と
+        apply_compiled() を使用する。
+
+        Args:
+            file_path: ファイルのパス
+            rules_dict: ルールデータの辞書
+            base_dir: 整理先のベースディレクトリ
+            stat_result: 取得済みのstat情報（省略時は必要に応じてos.statを呼び出す）
+
+        Returns:
+            目的地のパス。エラー時はNone
+        """
+        try:
+            compiled = self.compile_rules(rules_dict)
         except Exception as e:
             print(f"エラー: ルールの適用中にエラーが発生しました: {e}")
             return None
 
+        return self.apply_compiled(file_path, compiled, stat_result, base_dir)
+
     def create_default_rule(self, rule_name: str = "Default Rule") -> Dict:
         """
         デフォルトのルールセットを作成
@@ -253,19 +470,29 @@ class RuleEngine:
         rules = []
 
         try:
-            for filename in os.listdir(self.rules_dir):
-                if filename.endswith('.json'):
-                    rule_path = os.path.join(self.rules_dir, filename)
-                    rule_data = self.load_rules(rule_path)
-
-                    if rule_data:
-                        rules.append({
-                            "filename": filename,
-                            "path": rule_path,
-                            "name": rule_data.get("name", "名前なし"),
-                            "description": rule_data.get("description", ""),
-                            "version": rule_data.get("version", "1.0")
-                        })
+            with os.scandir(self.rules_dir) as it:
+                entries = [entry for entry in it if entry.name.endswith('.json')]
+
+            for entry in entries:
+                filename = entry.name
+                rule_path = entry.path
+                try:
+                    stat_result = entry.stat()
+                except OSError:
+                    # 一覧の取得後に削除されたファイルなど
+                    stat_result = None
+
+                # 名前などを参照するだけなのでコピーせずにキャッシュを使用
+                rule_data = self._load_rules_cached(rule_path, stat_result)
+
+                if rule_data:
+                    rules.append({
+                        "filename": filename,
+                        "path": rule_path,
+                        "name": rule_data.get("name", "名前なし"),
+                        "description": rule_data.get("description", ""),
+                        "version": rule_data.get("version", "1.0")
+                    })
 
             return rules
 
@@ -284,6 +511,7 @@ class RuleEngine:
             成功したらTrue、失敗したらFalse
         """
         try:
+            self._rule_cache.pop(rule_path, None)
             if os.path.exists(rule_path):
                 os.remove(rule_path)
                 print(f"ルールが削除されました: {rule_path}")
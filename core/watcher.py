@@ -3,12 +3,117 @@
 ファイルの作成・変更を監視して自動整理
 """
 
+import logging
 import os
+import re
+import sys
+import threading
 import time
-from typing import Dict, Optional, Callable, List
+from typing import Any, Dict, Optional, Callable, List
 from watchdog.observers import Observer
-from watchdog.events import FileSystemEventHandler, FileSystemEvent
-from .file_manager import FileOrganizer
+from watchdog.observers.api import ObservedWatch
+from watchdog.observers.polling import PollingObserver
+from watchdog.events import (
+    EVENT_TYPE_MOVED, FileCreatedEvent, FileModifiedEvent, FileMovedEvent,
+    FileSystemEventHandler, FileSystemEvent
+)
+from config.settings import WATCH_POLLING_INTERVAL
+from .file_manager import FileOrganizer, _compile_custom_patterns
+from .rule_engine import CompiledRules
+
+# 出力はアプリケーション側で設定したハンドラー（utils.configure_logging）が行う
+logger = logging.getLogger(__name__)
+
+# 整理で移動したファイルの作成イベントを無視する期間（秒）
+_ORGANIZED_EVENT_TTL = 10.0
+
+# 整理しない一時ファイルの拡張子
+_TEMPORARY_SUFFIXES = ('.tmp', '.temp', '.crdownload', '.part')
+
+# 整理しないシステムファイル
+_SYSTEM_FILES = frozenset({'Thumbs.db', 'desktop.ini', '.DS_Store'})
+
+# FileEventHandlerが処理するイベントの種類
+# （inotifyではこれ以外のオープン・クローズ・削除などをカーネル側で通知しなくなる）
+_HANDLED_EVENT_TYPES = [FileCreatedEvent, FileModifiedEvent, FileMovedEvent]
+
+# 変更通知（inotify）が届かないことがあるネットワークファイルシステム（/proc/mounts の種類）
+# fuse.sshfs などFUSE経由のものは "fuse." で始まる
+_NETWORK_FILESYSTEMS = frozenset({'cifs', 'smb3', 'smbfs', 'nfs', 'nfs4', 'afs', '9p', 'ncpfs'})
+
+# /proc/mounts で空白などをエスケープした8進表記（例: \040）
+_MOUNTS_ESCAPE = re.compile(r'\\([0-7]{3})')
+
+# GetDriveTypeW() のネットワークドライブ
+_DRIVE_REMOTE = 4
+
+
+def _schedule(observer: Observer, event_handler: FileSystemEventHandler,
+              path: str, recursive: bool) -> ObservedWatch:
+    """
+    オブザーバーに監視を登録（処理しない種類のイベントは通知されないようにする）
+
+    Args:
+        observer: オブザーバー
+        event_handler: イベントハンドラー
+        path: 監視するディレクトリのパス
+        recursive: サブディレクトリも監視するか
+
+    Returns:
+        登録された監視
+    """
+    try:
+        return observer.schedule(event_handler, path, recursive=recursive,
+                                 event_filter=_HANDLED_EVENT_TYPES)
+    except TypeError:
+        # watchdog 4.0 未満は event_filter に対応していない
+        return observer.schedule(event_handler, path, recursive=recursive)
+
+
+def _is_network_filesystem(path: str) -> bool:
+    """
+    パスがネットワークファイルシステム上にあるかを判定
+
+    Linuxでは /proc/mounts から最も深いマウントポイントの種類を、Windowsでは
+    ドライブの種類を調べる。判定できない環境ではFalseを返す。
+
+    Args:
+        path: ディレクトリのパス
+
+    Returns:
+        ネットワークファイルシステム上にある場合True
+    """
+    path = os.path.realpath(path)
+
+    if sys.platform == 'win32':
+        if path.startswith('\\\\'):
+            return True  # UNCパス
+        try:
+            import ctypes
+            drive = os.path.splitdrive(path)[0] + '\\'
+            return ctypes.windll.kernel32.GetDriveTypeW(drive) == _DRIVE_REMOTE
+        except (AttributeError, OSError):
+            return False
+
+    try:
+        with open('/proc/mounts', encoding='utf-8', errors='surrogateescape') as f:
+            mounts = f.read().splitlines()
+    except OSError:
+        return False
+
+    best_mount_point = ''
+    best_fstype = ''
+    for line in mounts:
+        fields = line.split()
+        if len(fields) < 3:
+            continue
+        mount_point = _MOUNTS_ESCAPE.sub(lambda m: chr(int(m.group(1), 8)), fields[1])
+        prefix = os.path.join(mount_point, '')
+        if (path == mount_point or path.startswith(prefix)) and len(mount_point) >= len(best_mount_point):
+            best_mount_point = mount_point
+            best_fstype = fields[2]
+
+    return best_fstype in _NETWORK_FILESYSTEMS or best_fstype.startswith('fuse.')
 
 
 class FileEventHandler(FileSystemEventHandler):
@@ -16,50 +121,123 @@ class FileEventHandler(FileSystemEventHandler):
 
     def __init__(self, rules: Dict, organizer: FileOrganizer,
                  callback: Optional[Callable[[str, str], None]] = None,
-                 delay: float = 2.0):
+                 delay: float = 2.0,
+                 compiled_rules: Optional[CompiledRules] = None,
+                 root: Optional[str] = None,
+                 recursive: bool = True):
         """
         Args:
             rules: 適用するルール辞書
             organizer: FileOrganizerインスタンス
             callback: イベント発生時のコールバック関数
             delay: ファイル作成後の待機時間（秒）
+            compiled_rules: rulesを前処理済みのルール（Noneの場合は最初のファイルで前処理する）
+            root: 監視しているディレクトリのパス（Noneの場合は監視範囲の内外を判定しない）
+            recursive: サブディレクトリも監視しているか
         """
         super().__init__()
         self.rules = rules
         self.organizer = organizer
         self.callback = callback
         self.delay = delay
-        self.processing = set()  # 処理中のファイルパス
+        self.recursive = recursive
 
-    def on_created(self, event: FileSystemEvent) -> None:
+        # 監視しているディレクトリの接頭辞（os.sepで終わる）
+        self._root_prefix: Optional[str] = os.path.join(root, '') if root is not None else None
+
+        # 走査と同じく、整理済みのカテゴリや除外パターンに一致するディレクトリのファイルは整理しない
+        self._exclude_pattern = _compile_custom_patterns(rules.get('exclude_patterns', []))
+
+        # 前処理済みのルール（set_rules()で破棄される）
+        self._compiled_rules: Optional[CompiledRules] = compiled_rules
+
+        # 整理待ちのファイルパス: 整理を行う時刻（time.monotonic()）
+        self.pending: Dict[str, float] = {}
+
+        # 監視開始時の走査で見つかった、整理先を決定済みのアクション
+        self._swept_actions: List[Dict[str, Any]] = []
+
+        # 整理で移動したファイルの移動先: 移動した時刻
+        # （移動はwatchdogから移動イベントとして、新しく作成された移動先ディレクトリの中身は
+        #   作成イベントとしても通知されるため、_ORGANIZED_EVENT_TTLの間は無視する）
+        self._organized: Dict[str, float] = {}
+        self._condition = threading.Condition()
+        self._stopped = False
+
+        # 待機時間が過ぎたファイルを整理するワーカースレッド
+        # （watchdogのイベント配送スレッドを待機でブロックしない）
+        self._worker = threading.Thread(target=self._run_worker, name="FileEventHandler", daemon=True)
+        self._worker.start()
+
+    def dispatch(self, event: FileSystemEvent) -> None:
         """
-        ファイル作成時の処理
+        イベントを種類ごとの処理に振り分け
+
+        ディレクトリや整理対象外のファイル、除外するディレクトリ内のファイルのイベントは、
+        振り分けの前に破棄する。移動イベントは移動先のパスで判定する
+        （一時ファイルからの名前の変更を整理するため）。
 
         Args:
             event: ファイルシステムイベント
         """
         if event.is_directory:
             return
+        file_path = event.dest_path if event.event_type == EVENT_TYPE_MOVED else event.src_path
+        if self._should_ignore(file_path) or self._in_excluded_directory(file_path):
+            return
+        super().dispatch(event)
 
-        file_path = event.src_path
+    def on_created(self, event: FileSystemEvent) -> None:
+        """
+        ファイル作成時の処理
 
-        # 既に処理中のファイルはスキップ
-        if file_path in self.processing:
-            return
+        Args:
+            event: ファイルシステムイベント
+        """
+        self._register(event.src_path)
 
-        # 整理対象外のファイルはスキップ
-        if self._should_ignore(file_path):
-            return
+    def on_moved(self, event: FileSystemEvent) -> None:
+        """
+        ファイル移動（名前の変更）時の処理
 
-        # コールバック実行
-        if self.callback:
-            self.callback("created", file_path)
+        ダウンロードの完了時など、一時ファイルから本来の名前に変更されたファイルや
+        監視範囲の外から移動されたファイルを、作成されたファイルと同様に整理待ちに登録する。
+        監視範囲内での名前の変更・移動は（整理済みのファイルに対するものを含め）
+        ユーザーの操作のため整理しない。ただし整理待ちのファイルは移動先で待機を続ける。
 
-        # 少し待機（ファイルの書き込みが完了するまで）
-        time.sleep(self.delay)
+        Args:
+            event: ファイルシステムイベント
+        """
+        with self._condition:
+            was_pending = self.pending.pop(event.src_path, None) is not None
 
-        # ファイルを整理
-        self._organize_file(file_path)
+        if (was_pending
+                or self._should_ignore(event.src_path)
+                or not self._is_watched(event.src_path)):
+            self._register(event.dest_path)
+
+    def _register(self, file_path: str) -> None:
+        """
+        ファイルを整理待ちに登録（既に待機中のファイルは待機時間を延長するのみ）
+
+        整理で移動したばかりのファイルは、同じ移動について作成・移動の両方のイベントが
+        通知されることがあるため、一定時間は何度通知されても登録しない。
+
+        Args:
+            file_path: ファイルのパス
+        """
+        now = time.monotonic()
+        with self._condition:
+            moved_at = self._organized.get(file_path)
+            if moved_at is not None and now - moved_at <= _ORGANIZED_EVENT_TTL:
+                return
+            is_new = file_path not in self.pending
+            self.pending[file_path] = now + self.delay
+            self._condition.notify()
+
+        # コールバック実行
+        if is_new and self.callback:
+            self.callback("created", file_path)
 
     def on_modified(self, event: FileSystemEvent) -> None:
         """
@@ -68,102 +246,247 @@ class FileEventHandler(FileSystemEventHandler):
         Args:
             event: ファイルシステムイベント
         """
-        # 変更イベントは頻繁に発生するため、作成時のみ処理
-        pass
+        # 変更イベントは頻繁に発生するため、新しいファイルの整理には使用しない。
+        # 整理待ちのファイルへの書き込みが続いている場合のみ待機時間を延長する
+        with self._condition:
+            if event.src_path in self.pending:
+                self.pending[event.src_path] = time.monotonic() + self.delay
+                self._condition.notify()
+
+    def set_rules(self, rules: Dict) -> None:
+        """
+        適用するルールを変更
+
+        Args:
+            rules: 適用するルール辞書
+        """
+        self.rules = rules
+        self._compiled_rules = None
+        self._exclude_pattern = _compile_custom_patterns(rules.get('exclude_patterns', []))
 
-    def _organize_file(self, file_path: str) -> None:
+    def sweep(self, directory: str, recursive: bool = True) -> None:
         """
-        個別のファイルを整理
+        ディレクトリに既に存在するファイルを整理
+
+        監視の開始前（停止中を含む）に追加されたファイルは作成イベントが通知されないため、
+        os.scandir()で走査して整理する。走査と整理先の決定は呼び出したスレッドで行い、
+        移動はワーカースレッドでイベントによる整理と同じように実行する。
 
         Args:
-            file_path: ファイルのパス
+            directory: 監視しているディレクトリのパス
+            recursive: サブディレクトリも走査するか
         """
-        try:
-            self.processing.add(file_path)
+        # 整理済みのファイルは整理先が現在の場所と一致するため、アクションは生成されない
+        actions = [
+            action for action in self.organizer.iter_actions(directory, self.rules, recursive=recursive)
+            if not self._should_ignore(action["source"])
+        ]
+        if not actions:
+            return
 
-            # ファイルが存在するか確認
-            if not os.path.exists(file_path):
+        with self._condition:
+            if self._stopped:
                 return
+            self._swept_actions.extend(actions)
+            self._condition.notify()
+
+    def stop(self) -> None:
+        """ワーカースレッドを停止（整理待ちのファイルは処理しない）"""
+        with self._condition:
+            self._stopped = True
+            self.pending.clear()
+            self._swept_actions.clear()
+            self._condition.notify()
+        self._worker.join(timeout=5)
+
+    def _run_worker(self) -> None:
+        """待機時間が過ぎたファイルを順に整理"""
+        while True:
+            with self._condition:
+                while not self._stopped:
+                    # 走査で見つかったファイルは待機せずに整理
+                    swept, self._swept_actions = self._swept_actions, []
+                    now = time.monotonic()
+                    ready = [path for path, deadline in self.pending.items() if deadline <= now]
+                    if ready or swept:
+                        for path in ready:
+                            del self.pending[path]
+                        break
+
+                    # 最も早い期限まで（整理待ちがなければ通知まで）待機
+                    timeout = min(self.pending.values()) - now if self.pending else None
+                    self._condition.wait(timeout)
+
+                if self._stopped:
+                    return
+
+            self._organize_files(ready, swept)
+
+    def _organize_files(self, file_paths: List[str],
+                        swept_actions: Optional[List[Dict[str, Any]]] = None) -> None:
+        """
+        待機時間が過ぎたファイルをまとめて整理
 
-            # 整理先を決定
-            source_dir = os.path.dirname(file_path)
-            destination = self.organizer.rule_engine.apply_rules(
-                file_path,
-                self.rules,
-                source_dir
-            )
+        Args:
+            file_paths: ファイルパスのリスト
+            swept_actions: 走査で見つかった、整理先を決定済みのアクション
+        """
+        try:
+            actions = list(swept_actions or ())
+
+            # 整理先を決定（ルールは最初のファイルで1回だけ前処理する）
+            if file_paths and self._compiled_rules is None:
+                self._compiled_rules = self.organizer.rule_engine.compile_rules(self.rules)
+
+            for file_path in file_paths:
+                # 存在確認とサイズの取得を1回のstatで行う
+                try:
+                    stat_result = os.stat(file_path)
+                except OSError:
+                    continue
+
+                # ディレクトリ名とファイル名を1回の分割で取得
+                source_dir, filename = os.path.split(file_path)
+                destination = self.organizer.rule_engine.apply_compiled(
+                    file_path,
+                    self._compiled_rules,
+                    stat_result,
+                    source_dir
+                )
+
+                if destination and destination != file_path:
+                    actions.append({
+                        "type": "move",
+                        "source": file_path,
+                        "destination": destination,
+                        "filename": filename,
+                        "size": stat_result.st_size,
+                        "status": "pending"
+                    })
+
+            if not actions:
+                return
 
-            if destination and destination != file_path:
-                # 移動を実行
-                actions = [{
-                    "type": "move",
-                    "source": file_path,
-                    "destination": destination,
-                    "filename": os.path.basename(file_path),
-                    "size": os.path.getsize(file_path),
-                    "status": "pending"
-                }]
+            # 移動直後に通知される作成イベントを無視できるよう、移動前に記録
+            planned = [action["destination"] for action in actions]
+            for destination in planned:
+                self._remember_organized(destination)
 
-                result = self.organizer.execute_actions(actions)
+            # 移動を1回の操作としてまとめて実行
+            self.organizer.execute_actions(actions)
 
-                if result["successful"] > 0:
-                    print(f"自動整理: {os.path.basename(file_path)} → {destination}")
-                    if self.callback:
-                        self.callback("organized", destination)
+            for action, destination in zip(actions, planned):
+                if action["status"] != "success":
+                    continue
+                if action["destination"] != destination:
+                    # 既存ファイルとの重複で名前が変更された場合
+                    self._remember_organized(action["destination"])
+                logger.info("自動整理: %s → %s", action["filename"], destination)
+                if self.callback:
+                    self.callback("organized", destination)
 
         except Exception as e:
-            print(f"エラー: ファイルの自動整理中にエラーが発生しました: {e}")
+            logger.error("エラー: ファイルの自動整理中にエラーが発生しました: %s", e)
 
-        finally:
-            # 処理完了
-            if file_path in self.processing:
-                self.processing.remove(file_path)
+    def _remember_organized(self, destination: str) -> None:
+        """
+        整理で移動したファイルを記録（古い記録は破棄）
 
-    def _should_ignore(self, file_path: str) -> bool:
+        Args:
+            destination: 移動先のパス
         """
-        ファイルを無視すべきかどうかを判定
+        now = time.monotonic()
+        with self._condition:
+            expired = [path for path, moved_at in self._organized.items()
+                       if now - moved_at > _ORGANIZED_EVENT_TTL]
+            for path in expired:
+                del self._organized[path]
+            self._organized[destination] = now
+
+    def _is_watched(self, file_path: str) -> bool:
+        """
+        ファイルが監視範囲内にあるかを判定
 
         Args:
             file_path: ファイルのパス
 
         Returns:
-            無視する場合True
+            監視しているディレクトリ（非再帰の場合は直下のみ）にある場合True
         """
-        filename = os.path.basename(file_path)
-
-        # 隠しファイル
-        if filename.startswith('.'):
+        if self._root_prefix is None:
             return True
+        directory = file_path.rpartition(os.sep)[0] + os.sep
+        if self.recursive:
+            return directory.startswith(self._root_prefix)
+        return directory == self._root_prefix
 
-        # 一時ファイル
-        if filename.endswith(('.tmp', '.temp', '.crdownload', '.part')):
-            return True
+    def _in_excluded_directory(self, file_path: str) -> bool:
+        """
+        ファイルが走査で除外されるディレクトリ（整理済みのカテゴリなど）の中にあるかを判定
 
-        # システムファイル
-        system_files = ['Thumbs.db', 'desktop.ini', '.DS_Store']
-        if filename in system_files:
-            return True
+        Args:
+            file_path: ファイルのパス
 
-        return False
+        Returns:
+            監視しているディレクトリからの途中のディレクトリのいずれかを除外する場合True
+        """
+        if self._root_prefix is None or not file_path.startswith(self._root_prefix):
+            return False
+        names = file_path[len(self._root_prefix):].split(os.sep)[:-1]
+        return any(self.organizer._should_exclude_directory(name, self._exclude_pattern)
+                   for name in names)
+
+    def _should_ignore(self, file_path: str) -> bool:
+        """
+        ファイルを無視すべきかどうかを判定
+
+        Args:
+            file_path: ファイルのパス
+
+        Returns:
+            無視する場合True
+        """
+        # watchdogのパスは最後の要素が常にos.sepで連結されるため、basename()より速い分割で十分
+        filename = file_path.rpartition(os.sep)[2]
+
+        # 隠しファイル（.DS_Store などを含む）、一時ファイル、システムファイル
+        return (filename.startswith('.')
+                or filename.endswith(_TEMPORARY_SUFFIXES)
+                or filename in _SYSTEM_FILES)
 
 
 class FolderWatcher:
     """フォルダを監視して自動整理を行うクラス"""
 
-    def __init__(self, organizer: Optional[FileOrganizer] = None):
+    def __init__(self, organizer: Optional[FileOrganizer] = None,
+                 observer: Optional[Observer] = None):
         """
         Args:
             organizer: FileOrganizerインスタンス
+            observer: 共有するオブザーバー（WatcherManagerから渡される）。
+                     Noneの場合は監視ごとに専用のオブザーバーを作成する
         """
         self.organizer = organizer or FileOrganizer()
         self.observer: Optional[Observer] = None
+        self.event_handler: Optional[FileEventHandler] = None
         self.is_watching = False
         self.watched_path: Optional[str] = None
+        self.recursive = True
+
+        self._shared_observer = observer
+        self._watch: Optional[ObservedWatch] = None  # 共有オブザーバーでの監視の登録
+
+        # 直前の監視の停止（オブザーバーとワーカースレッドの終了）が完了するとセットされる
+        self.stopped_event = threading.Event()
+        self.stopped_event.set()
 
     def start_watching(self, path: str, rules: Dict,
                       callback: Optional[Callable[[str, str], None]] = None,
                       recursive: bool = True,
-                      delay: float = 2.0) -> bool:
+                      delay: float = 2.0,
+                      sweep_existing: bool = True,
+                      use_polling: Optional[bool] = None,
+                      polling_interval: float = WATCH_POLLING_INTERVAL) -> bool:
         """
         フォルダの監視を開始
 
@@ -173,6 +496,10 @@ class FolderWatcher:
             callback: イベント発生時のコールバック関数 (event_type, file_path)
             recursive: サブディレクトリも監視するか
             delay: ファイル作成後の待機時間（秒）
+            sweep_existing: 監視開始時に既存のファイルも整理するか
+            use_polling: 変更通知の代わりに定期的な走査で監視するか
+                         （Noneの場合はネットワークファイルシステム上であれば走査する）
+            polling_interval: 走査で監視する場合の走査の間隔（秒）
 
         Returns:
             成功したらTrue、失敗したらFalse
@@ -184,64 +511,143 @@ class FolderWatcher:
 
             # パスの検証
             if not os.path.exists(path):
-                print(f"エラー: ディレクトリが存在しません: {path}")
+                logger.error("エラー: ディレクトリが存在しません: %s", path)
                 return False
 
             if not os.path.isdir(path):
-                print(f"エラー: 指定されたパスはディレクトリではありません: {path}")
+                logger.error("エラー: 指定されたパスはディレクトリではありません: %s", path)
                 return False
 
+            # ルールの解釈は監視中に変わらないため、ここで1回だけ行う
+            # （不正なルールは最初のイベントではなく監視の開始時にエラーになる）
+            compiled_rules = self.organizer.rule_engine.compile_rules(rules)
+
             # イベントハンドラーの作成
             event_handler = FileEventHandler(
                 rules=rules,
                 organizer=self.organizer,
                 callback=callback,
-                delay=delay
+                delay=delay,
+                compiled_rules=compiled_rules,
+                root=path,
+                recursive=recursive
             )
 
-            # オブザーバーの作成と開始
-            self.observer = Observer()
-            self.observer.schedule(event_handler, path, recursive=recursive)
-            self.observer.start()
+            if use_polling is None:
+                use_polling = _is_network_filesystem(path)
+
+            self.event_handler = event_handler
+            if not use_polling:
+                try:
+                    if self._shared_observer is not None:
+                        # 共有オブザーバーに監視を追加（スレッドとinotifyインスタンスは共有）
+                        self.observer = self._shared_observer
+                        self._watch = _schedule(self.observer, event_handler, path, recursive)
+                    else:
+                        # オブザーバーの作成と開始
+                        self.observer = Observer()
+                        _schedule(self.observer, event_handler, path, recursive)
+                        self.observer.start()
+                except OSError as e:
+                    # inotifyの監視数の上限などで変更通知を利用できない場合は走査で監視する
+                    logger.warning("警告: 変更通知を利用できないため、定期的な走査で監視します: %s", e)
+                    use_polling = True
+
+            if use_polling:
+                # SMB/NFSなどでは変更通知が届かないことがあるため、専用のオブザーバーで走査する
+                self.observer = PollingObserver(timeout=polling_interval)
+                _schedule(self.observer, event_handler, path, recursive)
+                self.observer.start()
 
             self.is_watching = True
             self.watched_path = path
-
-            print(f"フォルダ監視を開始しました: {path}")
+            self.recursive = recursive
+
+            if sweep_existing:
+                # 監視の登録後に走査するため、走査中に追加されたファイルも取りこぼさない
+                threading.Thread(
+                    target=event_handler.sweep,
+                    args=(path, recursive),
+                    name="FolderWatcherSweep",
+                    daemon=True
+                ).start()
+
+            logger.info("フォルダ監視を開始しました: %s", path)
             if recursive:
-                print("  サブディレクトリも監視します")
+                logger.info("  サブディレクトリも監視します")
 
             return True
 
         except Exception as e:
-            print(f"エラー: フォルダ監視の開始中にエラーが発生しました: {e}")
+            logger.error("エラー: フォルダ監視の開始中にエラーが発生しました: %s", e)
+            if self.event_handler and not self.is_watching:
+                self.event_handler.stop()
+                self.event_handler = None
             return False
 
     def stop_watching(self) -> bool:
         """
         フォルダの監視を停止
 
+        オブザーバーとワーカースレッドの終了は待たずに戻る（GUIスレッドをブロックしない）。
+        終了を待つ必要がある場合は stopped_event を使用する。
+
         Returns:
             成功したらTrue、失敗したらFalse
         """
         try:
             if not self.is_watching or not self.observer:
-                print("監視は実行されていません")
+                logger.info("監視は実行されていません")
                 return False
 
-            self.observer.stop()
-            self.observer.join(timeout=5)
+            observer = None
+            if self._watch is not None:
+                # 共有オブザーバーはほかの監視が使用しているため、登録のみ解除
+                self.observer.unschedule(self._watch)
+                self._watch = None
+            else:
+                self.observer.stop()
+                observer = self.observer
+
+            # 終了の待機はバックグラウンドで行う
+            self.stopped_event = threading.Event()
+            threading.Thread(
+                target=self._join_observer,
+                args=(observer, self.event_handler, self.stopped_event),
+                name="FolderWatcherStop",
+                daemon=True
+            ).start()
+            self.event_handler = None
 
             self.is_watching = False
-            print(f"フォルダ監視を停止しました: {self.watched_path}")
+            logger.info("フォルダ監視を停止しました: %s", self.watched_path)
             self.watched_path = None
 
             return True
 
         except Exception as e:
-            print(f"エラー: フォルダ監視の停止中にエラーが発生しました: {e}")
+            logger.error("エラー: フォルダ監視の停止中にエラーが発生しました: %s", e)
             return False
 
+    @staticmethod
+    def _join_observer(observer: Optional[Observer], event_handler: Optional[FileEventHandler],
+                       stopped_event: threading.Event) -> None:
+        """
+        停止したオブザーバーとイベントハンドラーの終了を待機
+
+        Args:
+            observer: 停止したオブザーバー（共有オブザーバーの場合はNone）
+            event_handler: 停止するイベントハンドラー
+            stopped_event: 終了後にセットするイベント
+        """
+        try:
+            if observer is not None:
+                observer.join(timeout=5)
+            if event_handler is not None:
+                event_handler.stop()
+        finally:
+            stopped_event.set()
+
     def is_active(self) -> bool:
         """
         監視が実行中かどうかを確認
@@ -249,6 +655,8 @@ class FolderWatcher:
         Returns:
             実行中の場合True
         """
+        if self.observer is self._shared_observer and self._watch is None:
+            return False
         return self.is_watching and self.observer is not None and self.observer.is_alive()
 
     def get_status(self) -> Dict[str, any]:
@@ -269,8 +677,92 @@ class WatcherManager:
     """複数のフォルダ監視を管理するクラス"""
 
     def __init__(self):
-        """複数のウォッチャーを管理"""
+        """
+        複数のウォッチャーを管理
+
+        すべてのウォッチャーで1つのオブザーバー（スレッドとinotifyなどの
+        監視インスタンス）を共有し、フォルダごとに監視を登録する。
+        """
         self.watchers: Dict[str, FolderWatcher] = {}
+        self.observer: Optional[Observer] = None
+
+        # 監視ディレクトリのパス区切りごとのトライ木（キーNoneにウォッチャー名のリスト）
+        self._path_trie: Dict[Optional[str], Any] = {}
+
+    @staticmethod
+    def _path_segments(path: str) -> List[str]:
+        """パスを正規化してトライ木のキー（区切りごとの要素）に分割"""
+        return [segment for segment in os.path.normcase(os.path.abspath(path)).split(os.sep) if segment]
+
+    def _trie_insert(self, path: str, name: str) -> None:
+        """監視ディレクトリをトライ木に登録"""
+        node = self._path_trie
+        for segment in self._path_segments(path):
+            node = node.setdefault(segment, {})
+        node.setdefault(None, []).append(name)
+
+    def _trie_remove(self, path: str, name: str) -> None:
+        """監視ディレクトリをトライ木から削除（不要になった節点も削除）"""
+        nodes = [self._path_trie]
+        segments = self._path_segments(path)
+        for segment in segments:
+            node = nodes[-1].get(segment)
+            if node is None:
+                return
+            nodes.append(node)
+
+        names = nodes[-1].get(None, [])
+        if name in names:
+            names.remove(name)
+        if not names:
+            nodes[-1].pop(None, None)
+
+        # 葉から順に空の節点を削除
+        for parent, segment, node in zip(reversed(nodes[:-1]), reversed(segments), reversed(nodes[1:])):
+            if node:
+                break
+            del parent[segment]
+
+    def watcher_for_path(self, path: str) -> Optional[FolderWatcher]:
+        """
+        パスを監視しているウォッチャーを取得
+
+        監視ディレクトリのうち、パスを含む最も深いものを担当とする
+        （サブディレクトリを監視しないウォッチャーは直下のファイルのみ担当）。
+        ウォッチャーの数によらず、パスの深さに比例する時間で求められる。
+
+        Args:
+            path: ファイルまたはディレクトリのパス
+
+        Returns:
+            担当のウォッチャー。該当なしの場合はNone
+        """
+        segments = self._path_segments(path)
+        node = self._path_trie
+        found = None
+
+        for depth in range(len(segments) + 1):
+            for name in node.get(None, ()):
+                watcher = self.watchers.get(name)
+                # 監視ディレクトリ自身と直下のファイルは常に担当、それより深い場合は再帰監視のみ
+                if watcher is not None and (depth >= len(segments) - 1 or watcher.recursive):
+                    found = watcher
+                    break
+
+            if depth == len(segments):
+                break
+            node = node.get(segments[depth])
+            if node is None:
+                break
+
+        return found
+
+    def _get_observer(self) -> Observer:
+        """共有オブザーバーを取得（未開始の場合は作成して開始）"""
+        if self.observer is None or not self.observer.is_alive():
+            self.observer = Observer()
+            self.observer.start()
+        return self.observer
 
     def add_watcher(self, name: str, path: str, rules: Dict,
                    callback: Optional[Callable[[str, str], None]] = None,
@@ -289,12 +781,13 @@ class WatcherManager:
             成功したらTrue
         """
         if name in self.watchers:
-            print(f"警告: '{name}'という名前のウォッチャーは既に存在します")
+            logger.warning("警告: '%s'という名前のウォッチャーは既に存在します", name)
             return False
 
-        watcher = FolderWatcher()
+        watcher = FolderWatcher(observer=self._get_observer())
         if watcher.start_watching(path, rules, callback, recursive):
             self.watchers[name] = watcher
+            self._trie_insert(path, name)
             return True
 
         return False
@@ -310,10 +803,11 @@ class WatcherManager:
             成功したらTrue
         """
         if name not in self.watchers:
-            print(f"エラー: '{name}'という名前のウォッチャーは存在しません")
+            logger.error("エラー: '%s'という名前のウォッチャーは存在しません", name)
             return False
 
         watcher = self.watchers[name]
+        self._trie_remove(watcher.watched_path, name)
         watcher.stop_watching()
         del self.watchers[name]
 
@@ -325,7 +819,14 @@ class WatcherManager:
             watcher.stop_watching()
 
         self.watchers.clear()
-        print("すべてのウォッチャーを停止しました")
+        self._path_trie.clear()
+
+        # 共有オブザーバーはここで1回だけ停止
+        if self.observer is not None:
+            self.observer.stop()
+            self.observer.join(timeout=5)
+            self.observer = None
+        logger.info("すべてのウォッチャーを停止しました")
 
     def get_all_status(self) -> Dict[str, Dict]:
         """
@@ -31,9 +31,9 @@ def main():
         print("プレビューボタンをクリック")
         window._preview_organization()
 
-    # 2秒後に自動テスト
+    # ルールはコンストラクタで読み込み済みのため、イベントループの開始直後に自動テスト
     from PyQt6.QtCore import QTimer
-    QTimer.singleShot(2000, test_preview)
+    QTimer.singleShot(0, test_preview)
 
     window.show()
     sys.exit(app.exec())
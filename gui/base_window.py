@@ -7,6 +7,20 @@ from PyQt6.QtWidgets import QMainWindow, QDialog
 from PyQt6.QtCore import Qt
 from typing import Optional
 
+# メインウィンドウのウィンドウフラグ
+_BASE_WINDOW_FLAGS = (
+    Qt.WindowType.Window |
+    Qt.WindowType.WindowCloseButtonHint |
+    Qt.WindowType.WindowMinimizeButtonHint |
+    Qt.WindowType.WindowMaximizeButtonHint
+)
+
+# ダイアログのウィンドウフラグ
+_BASE_DIALOG_FLAGS = (
+    Qt.WindowType.Dialog |
+    Qt.WindowType.WindowCloseButtonHint
+)
+
 
 class BaseWindow(QMainWindow):
     """メインウィンドウの基底クラス"""
@@ -18,12 +32,7 @@ class BaseWindow(QMainWindow):
     def _setup_window(self) -> None:
         """ウィンドウの基本設定"""
         # ウィンドウフラグの設定
-        self.setWindowFlags(
-            Qt.WindowType.Window |
-            Qt.WindowType.WindowCloseButtonHint |
-            Qt.WindowType.WindowMinimizeButtonHint |
-            Qt.WindowType.WindowMaximizeButtonHint
-        )
+        self.setWindowFlags(_BASE_WINDOW_FLAGS)
 
     def center_on_screen(self) -> None:
         """ウィンドウを画面中央に配置"""
@@ -56,10 +65,7 @@ class BaseDialog(QDialog):
         self.setModal(modal)
 
         # ウィンドウフラグの設定
-        self.setWindowFlags(
-            Qt.WindowType.Dialog |
-            Qt.WindowType.WindowCloseButtonHint
-        )
+        self.setWindowFlags(_BASE_DIALOG_FLAGS)
 
     def center_on_screen(self) -> None:
         """ダイアログを画面中央に配置"""
@@ -5,9 +5,13 @@
 
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
+import hashlib
+import json
 import os
-import threading
-from typing import Optional, Dict
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, List, Tuple
 
 # コアモジュール
 from core import FileOrganizer, RuleEngine, DuplicateDetector, FolderWatcher
@@ -18,6 +22,41 @@ from .progress_dialog import ProgressDialog, IndeterminateProgressDialog
 from .preview_dialog import PreviewDialog
 from .rule_editor import RuleEditorDialog
 
+# 監視スレッドから受け取ったイベントを保持する最大件数（古いものから破棄）
+_WATCH_EVENT_QUEUE_SIZE = 1000
+
+# 監視イベントをまとめてステータスバーに反映する間隔（ミリ秒）
+_WATCH_DRAIN_INTERVAL_MS = 200
+
+# 整理の進捗をダイアログに反映する最小間隔（秒）
+_PROGRESS_UPDATE_INTERVAL = 0.1
+
+# 「使い方」に表示するテキスト
+_HELP_TEXT = """File Organizer - ファイル整理ツール
+
+【基本的な使い方】
+1. 整理元ディレクトリを選択
+2. ルールを編集（必要に応じて）
+3. プレビューで確認
+4. 整理実行
+
+【機能】
+- 拡張子別分類
+- 日付別分類
+- ファイルサイズ別分類
+- ファイル名パターン分類
+- 自動整理（フォルダ監視）
+- バックアップ作成
+- 元に戻す機能"""
+
+# 「バージョン情報」に表示するテキスト
+_ABOUT_TEXT = """File Organizer
+Version 1.0.0
+
+フル機能のファイル整理ツール
+
+(c) 2026"""
+
 
 class MainWindow(tk.Tk):
     """メインウィンドウクラス"""
@@ -31,14 +70,27 @@ class MainWindow(tk.Tk):
         # コンポーネントの初期化
         self.organizer = FileOrganizer()
         self.rule_engine = RuleEngine()
-        self.backup_manager = BackupManager()
-        self.duplicate_detector = DuplicateDetector()
+        # バックアップ・重複検出は使用時まで生成しない（起動時のディスクアクセスを避ける）
+        self._backup_manager: Optional[BackupManager] = None
+        self._duplicate_detector: Optional[DuplicateDetector] = None
         self.watcher: Optional[FolderWatcher] = None
 
+        # プレビュー・実行・元に戻す・バックアップを順に実行するワーカー
+        # （操作ごとにスレッドを作成せず、同時に実行された操作が互いのファイルを変更しないようにする）
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="FileOrganizerWorker")
+
+        # 監視スレッドからのイベント（Tkはスレッドセーフでないため、メインループで取り出す）
+        self._watch_events = deque(maxlen=_WATCH_EVENT_QUEUE_SIZE)
+        self._watch_drain_id: Optional[str] = None
+
         # 現在のルールとアクション
         self.current_rules: Optional[Dict] = None
         self.current_actions = []
 
+        # 直前のプレビュー結果（(整理元, 整理先, 操作モード, ルールの指紋), アクションリスト）
+        # 条件が同じまま整理を実行する場合はディレクトリを走査し直さずに再利用する
+        self._preview_cache: Optional[Tuple[Tuple[str, str, str, bytes], List[Dict]]] = None
+
         # UIの作成
         self._create_menu()
         self._create_widgets()
@@ -49,6 +101,20 @@ class MainWindow(tk.Tk):
         # ウィンドウを中央に配置
         self.center_window()
 
+    @property
+    def backup_manager(self) -> BackupManager:
+        """バックアップマネージャー（初回アクセス時に生成）"""
+        if self._backup_manager is None:
+            self._backup_manager = BackupManager()
+        return self._backup_manager
+
+    @property
+    def duplicate_detector(self) -> DuplicateDetector:
+        """重複検出器（初回アクセス時に生成）"""
+        if self._duplicate_detector is None:
+            self._duplicate_detector = DuplicateDetector()
+        return self._duplicate_detector
+
     def _create_menu(self) -> None:
         """メニューバーを作成"""
         menubar = tk.Menu(self)
@@ -245,13 +311,14 @@ class MainWindow(tk.Tk):
         file_path = filedialog.askopenfilename(
             title="ルールファイルを開く",
             filetypes=[("JSONファイル", "*.json"), ("すべてのファイル", "*.*")],
-            initialdir="data/rules"
+            initialdir=self.rule_engine.rules_dir
         )
 
         if file_path:
             rules = self.rule_engine.load_rules(file_path)
             if rules:
                 self.current_rules = rules
+                self._preview_cache = None
                 self._update_rule_display()
                 self.update_status(f"ルールを読み込みました: {file_path}")
 
@@ -265,7 +332,7 @@ class MainWindow(tk.Tk):
             title="ルールを保存",
             defaultextension=".json",
             filetypes=[("JSONファイル", "*.json"), ("すべてのファイル", "*.*")],
-            initialdir="data/rules"
+            initialdir=self.rule_engine.rules_dir
         )
 
         if file_path:
@@ -279,15 +346,33 @@ class MainWindow(tk.Tk):
 
         if dialog.result_rules:
             self.current_rules = dialog.result_rules
+            self._preview_cache = None
             self._update_rule_display()
             self.update_status("ルールを更新しました")
 
     def _load_default_rule(self) -> None:
         """デフォルトルールを読み込み"""
         self.current_rules = self.rule_engine.create_default_rule()
+        self._preview_cache = None
         self._update_rule_display()
         self.update_status("デフォルトルールを読み込みました")
 
+    def _preview_key(self, source_dir: str, output_dir: str) -> Tuple[str, str, str, bytes]:
+        """
+        プレビュー結果を再利用できるかを判定するためのキーを作成
+
+        Args:
+            source_dir: 整理元のディレクトリ
+            output_dir: 整理先のディレクトリ
+
+        Returns:
+            (整理元, 整理先, 操作モード, ルールの指紋) のタプル
+        """
+        # ルールは辞書のため、キーの順序によらない直列化のハッシュで比較する
+        serialized = json.dumps(self.current_rules, sort_keys=True, ensure_ascii=False)
+        fingerprint = hashlib.blake2b(serialized.encode('utf-8'), digest_size=16).digest()
+        return (source_dir, output_dir, self.operation_mode_var.get(), fingerprint)
+
     def _update_rule_display(self) -> None:
         """ルール表示を更新"""
         if not self.current_rules:
@@ -327,9 +412,11 @@ class MainWindow(tk.Tk):
             message="整理内容を分析しています..."
         )
 
+        output_dir = self.output_dir_var.get() or source_dir
+        preview_key = self._preview_key(source_dir, output_dir)
+
         def generate_preview():
             try:
-                output_dir = self.output_dir_var.get() or source_dir
                 actions = self.organizer.organize(
                     source_dir,
                     self.current_rules,
@@ -339,6 +426,7 @@ class MainWindow(tk.Tk):
                 )
 
                 self.current_actions = actions
+                self._preview_cache = (preview_key, actions)
 
                 # メインスレッドでプレビューを表示
                 self.after(0, lambda: self._show_preview_dialog(actions, progress_dialog))
@@ -347,9 +435,8 @@ class MainWindow(tk.Tk):
                 self.after(0, lambda: messagebox.showerror("エラー", f"プレビュー生成中にエラーが発生しました:\n{e}"))
                 self.after(0, progress_dialog.close)
 
-        # 別スレッドで実行
-        thread = threading.Thread(target=generate_preview, daemon=True)
-        thread.start()
+        # バックグラウンドのワーカーで実行
+        self._executor.submit(generate_preview)
 
     def _show_preview_dialog(self, actions, progress_dialog) -> None:
         """プレビューダイアログを表示"""
@@ -402,8 +489,7 @@ class MainWindow(tk.Tk):
                     self.update_status(f"バックアップを作成しました: {backup_id}")
                 self.after(0, self._execute_organization_worker)
 
-            thread = threading.Thread(target=create_backup, daemon=True)
-            thread.start()
+            self._executor.submit(create_backup)
         else:
             self._execute_organization_worker()
 
@@ -412,8 +498,11 @@ class MainWindow(tk.Tk):
         source_dir = self.source_dir_var.get()
         output_dir = self.output_dir_var.get() or source_dir
 
-        # アクション生成
-        if not self.current_actions:
+        # アクション生成（同じ条件のプレビュー結果があれば再利用）
+        preview_key = self._preview_key(source_dir, output_dir)
+        if self._preview_cache is not None and self._preview_cache[0] == preview_key:
+            self.current_actions = self._preview_cache[1]
+        else:
             self.current_actions = self.organizer.organize(
                 source_dir,
                 self.current_rules,
@@ -430,6 +519,9 @@ class MainWindow(tk.Tk):
 
     def _execute_with_actions(self, actions) -> None:
         """アクションを実行"""
+        # 実行後はファイルの配置が変わるため、プレビュー結果は再利用できない
+        self._preview_cache = None
+
         # 進捗ダイアログを表示
         progress_dialog = ProgressDialog(
             self,
@@ -437,8 +529,16 @@ class MainWindow(tk.Tk):
             total_items=len(actions)
         )
 
+        last_update = 0.0
+
         def progress_callback(current, total, message):
-            self.after(0, lambda: progress_dialog.update_progress(current, message))
+            # ファイルごとにメインループへ通知すると実行が遅くなるため、一定間隔で間引く
+            # （最後の1件は必ず反映する）
+            nonlocal last_update
+            now = time.monotonic()
+            if current >= total or now - last_update >= _PROGRESS_UPDATE_INTERVAL:
+                last_update = now
+                self.after(0, lambda: progress_dialog.update_progress(current, message))
 
         def execute():
             try:
@@ -467,15 +567,25 @@ class MainWindow(tk.Tk):
             finally:
                 self.after(0, progress_dialog.destroy)
 
-        # 別スレッドで実行
-        thread = threading.Thread(target=execute, daemon=True)
-        thread.start()
+        # バックグラウンドのワーカーで実行
+        self._executor.submit(execute)
 
     def _undo_last_operation(self) -> None:
         """最後の操作を元に戻す"""
-        # 最新のログファイルを取得
-        logs = self.organizer.logger.list_logs(limit=1)
+        def load_last_log():
+            # 最新のログファイルを取得（ディレクトリの走査とJSONの解析はメインスレッドで行わない）
+            logs = self.organizer.logger.list_logs(limit=1)
+            self.after(0, lambda: self._confirm_undo(logs))
 
+        self._executor.submit(load_last_log)
+
+    def _confirm_undo(self, logs: List[Dict]) -> None:
+        """
+        元に戻す操作を確認して実行（メインスレッドで呼び出す）
+
+        Args:
+            logs: list_logs()で取得した最新のログ情報
+        """
         if not logs:
             messagebox.showinfo("情報", "元に戻す操作がありません")
             return
@@ -508,8 +618,7 @@ class MainWindow(tk.Tk):
                 self.after(0, progress_dialog.close)
                 self.after(0, lambda: messagebox.showerror("エラー", f"エラーが発生しました:\n{e}"))
 
-        thread = threading.Thread(target=undo, daemon=True)
-        thread.start()
+        self._executor.submit(undo)
 
     def _toggle_watch(self) -> None:
         """フォルダ監視の開始/停止を切り替え"""
@@ -517,6 +626,7 @@ class MainWindow(tk.Tk):
             # 監視停止
             self.watcher.stop_watching()
             self.watcher = None
+            self._stop_watch_drain()
             self.watch_button.config(text="監視開始")
             self.watch_status_label.config(text="停止中", foreground="gray")
             self.update_status("フォルダ監視を停止しました")
@@ -533,14 +643,52 @@ class MainWindow(tk.Tk):
                 return
 
             def watch_callback(event_type, file_path):
-                self.update_status(f"自動整理: {os.path.basename(file_path)}")
+                # 監視スレッドから呼ばれるため、キューに追加するのみ
+                self._watch_events.append((event_type, file_path))
+
+            # サブディレクトリへの監視の登録はこのスレッドで行われ、大きなフォルダでは時間がかかる
+            self.update_status_now(f"フォルダ監視を開始しています: {source_dir}")
 
             self.watcher = FolderWatcher(self.organizer)
             if self.watcher.start_watching(source_dir, self.current_rules, watch_callback):
+                self._watch_drain_id = self.after(_WATCH_DRAIN_INTERVAL_MS, self._drain_watch_events)
                 self.watch_button.config(text="監視停止")
                 self.watch_status_label.config(text="監視中", foreground="green")
                 self.update_status(f"フォルダ監視を開始しました: {source_dir}")
 
+    def _drain_watch_events(self) -> None:
+        """監視イベントをまとめて取り出し、ステータスバーを1回だけ更新"""
+        events = []
+        while self._watch_events:
+            events.append(self._watch_events.popleft())
+
+        if events:
+            organized = [file_path for event_type, file_path in events if event_type == "organized"]
+            latest = organized[-1] if organized else events[-1][1]
+            if len(organized) > 1:
+                message = f"自動整理: {len(organized)}件（最新: {os.path.basename(latest)}）"
+            else:
+                message = f"自動整理: {os.path.basename(latest)}"
+            self.status_label.config(text=message)
+
+        self._watch_drain_id = self.after(_WATCH_DRAIN_INTERVAL_MS, self._drain_watch_events)
+
+    def _stop_watch_drain(self) -> None:
+        """監視イベントの取り出しを停止"""
+        if self._watch_drain_id is not None:
+            self.after_cancel(self._watch_drain_id)
+            self._watch_drain_id = None
+        self._watch_events.clear()
+
+    def destroy(self) -> None:
+        """ウィンドウを破棄（実行待ちの操作は取り消す）"""
+        try:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+        except TypeError:
+            # Python 3.8 は cancel_futures に対応していない
+            self._executor.shutdown(wait=False)
+        super().destroy()
+
     def _detect_duplicates(self) -> None:
         """重複ファイルを検出"""
         source_dir = self.source_dir_var.get()
@@ -561,41 +709,27 @@ class MainWindow(tk.Tk):
 
     def _show_help(self) -> None:
         """使い方を表示"""
-        help_text = """
-        File Organizer - ファイル整理ツール
-
-        【基本的な使い方】
-        1. 整理元ディレクトリを選択
-        2. ルールを編集（必要に応じて）
-        3. プレビューで確認
-        4. 整理実行
-
-        【機能】
-        - 拡張子別分類
-        - 日付別分類
-        - ファイルサイズ別分類
-        - ファイル名パターン分類
-        - 自動整理（フォルダ監視）
-        - バックアップ作成
-        - 元に戻す機能
-        """
-        messagebox.showinfo("使い方", help_text)
+        messagebox.showinfo("使い方", _HELP_TEXT)
 
     def _show_about(self) -> None:
         """バージョン情報を表示"""
-        about_text = """
-        File Organizer
-        Version 1.0.0
-
-        フル機能のファイル整理ツール
+        messagebox.showinfo("バージョン情報", _ABOUT_TEXT)
 
-        (c) 2026
+    def update_status(self, message: str) -> None:
         """
-        messagebox.showinfo("バージョン情報", about_text)
+        ステータスバーを更新
 
-    def update_status(self, message: str) -> None:
-        """ステータスバーを更新"""
+        再描画はイベントループに任せるため、コールバックから頻繁に呼んでもよい。
+        """
         self.status_label.config(text=message)
+
+    def update_status_now(self, message: str) -> None:
+        """
+        ステータスバーを更新して直ちに再描画
+
+        イベントループに戻らない同期処理の前に表示を確定させたい場合に使用する。
+        """
+        self.update_status(message)
         self.update_idletasks()
 
     def center_window(self) -> None:
@@ -5,9 +5,34 @@
 
 import tkinter as tk
 from tkinter import ttk
-from typing import List, Dict, Optional, Any
+from functools import lru_cache
+from typing import List, Dict, Optional, Any, Tuple
 import os
 
+# 最初に表示する行数（表示領域より少し多め）
+_INITIAL_ROWS = 100
+
+# スクロールで末尾に近づいた時に追加で表示する行数
+_RENDER_CHUNK_ROWS = 200
+
+# 表示済みの末尾がこの位置（0.0〜1.0）より上まで見えたら次の行を追加
+_RENDER_THRESHOLD = 0.9
+
+# 入力が止まってからフィルターを適用するまでの時間（ミリ秒）
+_FILTER_DELAY_MS = 150
+
+
+@lru_cache(maxsize=4096)
+def _format_size(size_bytes: int) -> str:
+    """
+    バイト数を人間が読みやすい形式に変換（同じサイズの結果は再利用）
+    """
+    for unit in ['B', 'KB', 'MB', 'GB', 'TB']:
+        if size_bytes < 1024.0:
+            return f"{size_bytes:.1f} {unit}"
+        size_bytes /= 1024.0
+    return f"{size_bytes:.1f} PB"
+
 
 class PreviewDialog(tk.Toplevel):
     """整理アクションのプレビューダイアログ"""
@@ -21,10 +46,42 @@ class PreviewDialog(tk.Toplevel):
         super().__init__(parent)
         self.title("プレビュー - 整理内容の確認")
         self.actions = actions
-        self.filtered_actions = actions.copy()
         self.confirmed = False
         self.selected_actions = []
 
+        # フィルターに一致したアクションの位置（アクションの辞書はコピーしない）
+        self.filtered_indices: List[int] = list(range(len(actions)))
+
+        # 表示する列の値（フィルターのたびに作り直さないよう、ここで1回だけ作成）
+        self._display_rows = [self._build_display_row(action) for action in actions]
+
+        # 検索用に小文字化したパス。移動元・移動先のディレクトリは多くのアクションで共通のため
+        # 一覧（_search_dirs）に1回だけ保持し、アクションごとには (移動元のディレクトリ番号,
+        # 移動元のファイル名, 移動先のディレクトリ番号, 移動先のファイル名) のみ保持する
+        self._search_dirs: List[str] = []
+        self._search_keys = self._build_search_keys(actions)
+
+        # 統計情報（絞り込み後の合計サイズはフィルターの走査中に集計する）
+        self._sizes = [action.get('size', 0) for action in actions]
+        self._total_size = sum(self._sizes)
+        self._filtered_size = self._total_size
+
+        # タイプごとのアクションの位置と合計サイズ（タイプのみの絞り込みは走査せずに求める）
+        self._indices_by_type: Dict[str, List[int]] = {}
+        self._size_by_type: Dict[str, int] = {}
+        for index, (row, size) in enumerate(zip(self._display_rows, self._sizes)):
+            self._indices_by_type.setdefault(row[0], []).append(index)
+            self._size_by_type[row[0]] = self._size_by_type.get(row[0], 0) + size
+
+        # ツリービューには表示領域付近の行のみ挿入し、スクロールに応じて追加する
+        self._rendered_count = 0
+        self._render_after_id: Optional[str] = None  # 予約中の行の追加（after_idle()のID）
+        self._item_indices: Dict[str, int] = {}  # アイテムID: アクションの位置
+        self._select_all_rows = False  # 「全て選択」後に追加された行も選択する
+
+        # 予約中のフィルター適用（after()のID）
+        self._filter_after_id: Optional[str] = None
+
         # ウィンドウの設定
         self.geometry("900x600")
         self.transient(parent)
@@ -73,7 +130,7 @@ class PreviewDialog(tk.Toplevel):
         ttk.Label(filter_frame, text="検索:").pack(side=tk.LEFT, padx=(0, 5))
 
         self.search_var = tk.StringVar()
-        self.search_var.trace('w', lambda *args: self._apply_filter())
+        self.search_var.trace_add('write', lambda *args: self._schedule_filter())
         search_entry = ttk.Entry(filter_frame, textvariable=self.search_var, width=30)
         search_entry.pack(side=tk.LEFT, padx=(0, 10))
 
@@ -88,7 +145,7 @@ class PreviewDialog(tk.Toplevel):
             width=10
         )
         type_combo.pack(side=tk.LEFT)
-        type_combo.bind('<<ComboboxSelected>>', lambda e: self._apply_filter())
+        type_combo.bind('<<ComboboxSelected>>', lambda e: self._schedule_filter())
 
         # ツリービューフレーム
         tree_frame = ttk.Frame(main_frame)
@@ -97,6 +154,7 @@ class PreviewDialog(tk.Toplevel):
         # スクロールバー
         scrollbar_y = ttk.Scrollbar(tree_frame, orient=tk.VERTICAL)
         scrollbar_y.pack(side=tk.RIGHT, fill=tk.Y)
+        self.scrollbar_y = scrollbar_y
 
         scrollbar_x = ttk.Scrollbar(tree_frame, orient=tk.HORIZONTAL)
         scrollbar_x.pack(side=tk.BOTTOM, fill=tk.X)
@@ -106,7 +164,7 @@ class PreviewDialog(tk.Toplevel):
             tree_frame,
             columns=('type', 'filename', 'source', 'destination', 'size'),
             show='tree headings',
-            yscrollcommand=scrollbar_y.set,
+            yscrollcommand=self._on_tree_yview,
             xscrollcommand=scrollbar_x.set,
             selectmode='extended'
         )
@@ -128,6 +186,7 @@ class PreviewDialog(tk.Toplevel):
         self.tree.heading('size', text='サイズ')
 
         self.tree.pack(fill=tk.BOTH, expand=True)
+        self.tree.bind('<<TreeviewSelect>>', self._on_tree_select)
 
         scrollbar_y.config(command=self.tree.yview)
         scrollbar_x.config(command=self.tree.xview)
@@ -170,76 +229,224 @@ class PreviewDialog(tk.Toplevel):
         ).pack(side=tk.LEFT)
 
     def _populate_tree(self) -> None:
-        """ツリービューにデータを表示"""
-        # 既存のアイテムをクリア
-        for item in self.tree.get_children():
-            self.tree.delete(item)
+        """
+        ツリービューにデータを表示
 
-        # アクションを追加
-        for i, action in enumerate(self.filtered_actions, 1):
-            filename = action.get('filename', os.path.basename(action['source']))
-            size_formatted = self._format_size(action.get('size', 0))
+        すべての行を挿入すると件数に比例して時間がかかるため、最初は表示領域付近の
+        行のみ挿入し、残りはスクロールに応じて _render_chunk() で追加する。
+        """
+        # 既存のアイテムを1回の呼び出しでクリア
+        children = self.tree.get_children()
+        if children:
+            self.tree.delete(*children)
+
+        self._item_indices.clear()
+        self._rendered_count = 0
+        self._select_all_rows = False
+
+        self._render_chunk(0, _INITIAL_ROWS)
+
+    def _render_chunk(self, start: int, end: int) -> None:
+        """
+        絞り込んだアクションのうち指定範囲の行をツリービューに追加
 
-            self.tree.insert(
+        Args:
+            start: 追加する最初の行の位置
+            end: 追加する最後の行の次の位置
+        """
+        items = []
+        for i, index in enumerate(self.filtered_indices[start:end], start + 1):
+            item = self.tree.insert(
                 '',
                 'end',
                 text=str(i),
-                values=(
-                    action['type'],
-                    filename,
-                    action['source'],
-                    action['destination'],
-                    size_formatted
-                ),
+                values=self._display_rows[index],
                 tags=('action',)
             )
+            self._item_indices[item] = index
+            items.append(item)
+
+        self._rendered_count = start + len(items)
+
+        if self._select_all_rows and items:
+            self.tree.selection_add(items)
+
+    def _on_tree_yview(self, first: str, last: str) -> None:
+        """
+        ツリービューのスクロール位置の変更時の処理
+
+        表示済みの行の末尾付近までスクロールされたら、次の行の追加を予約する。
+
+        Args:
+            first: 表示領域の先頭の位置（0.0〜1.0）
+            last: 表示領域の末尾の位置（0.0〜1.0）
+        """
+        self.scrollbar_y.set(first, last)
+
+        if (float(last) >= _RENDER_THRESHOLD
+                and self._rendered_count < len(self.filtered_indices)
+                and self._render_after_id is None):
+            # スクロール処理の途中でアイテムを追加しないよう、アイドル時に追加
+            self._render_after_id = self.after_idle(self._render_next_chunk)
+
+    def _on_tree_select(self, event=None) -> None:
+        """
+        選択の変更時の処理
+
+        表示済みの行の一部だけが選択された場合は「全て選択」の状態を解除し、
+        未表示の行を選択済みとして扱わないようにする。
+        """
+        if self._select_all_rows and len(self.tree.selection()) < self._rendered_count:
+            self._select_all_rows = False
+
+    def _render_next_chunk(self) -> None:
+        """表示済みの行の次から一定数の行を追加"""
+        self._render_after_id = None
+        start = self._rendered_count
+        self._render_chunk(start, start + _RENDER_CHUNK_ROWS)
+
+    def _schedule_filter(self) -> None:
+        """
+        フィルターの適用を予約
+
+        入力が続いている間は予約をやり直し、入力が止まった時に1回だけ適用する。
+        """
+        if self._filter_after_id is not None:
+            self.after_cancel(self._filter_after_id)
+        self._filter_after_id = self.after(_FILTER_DELAY_MS, self._apply_filter)
 
     def _apply_filter(self) -> None:
         """フィルターを適用"""
+        self._filter_after_id = None
+
         search_text = self.search_var.get().lower()
         action_type = self.type_var.get()
 
-        # フィルタリング
-        self.filtered_actions = []
-
-        for action in self.actions:
-            # タイプフィルター
-            if action_type != "全て" and action['type'] != action_type:
-                continue
-
-            # 検索フィルター
-            if search_text:
-                filename = action.get('filename', os.path.basename(action['source']))
-                source = action['source']
-                destination = action['destination']
+        # タイプで絞り込んだ候補（タイプごとの位置は作成時に分類済み）
+        if action_type == "全て":
+            candidates = range(len(self.actions))
+            candidates_size = self._total_size
+        else:
+            candidates = self._indices_by_type.get(action_type, [])
+            candidates_size = self._size_by_type.get(action_type, 0)
 
-                if not (search_text in filename.lower() or
-                       search_text in source.lower() or
-                       search_text in destination.lower()):
-                    continue
+        if not search_text:
+            # 検索条件なしの場合は候補をそのまま使用（合計サイズも集計済み）
+            self.filtered_indices = list(candidates)
+            filtered_size = candidates_size
+        else:
+            self.filtered_indices = self._search(search_text, candidates)
+            sizes = self._sizes
+            filtered_size = sum(sizes[index] for index in self.filtered_indices)
 
-            self.filtered_actions.append(action)
+        self._filtered_size = filtered_size
 
         # ツリービューを更新
         self._populate_tree()
         self._update_statistics()
 
+    @staticmethod
+    def _build_display_row(action: Dict[str, Any]) -> Tuple[str, str, str, str, str]:
+        """
+        アクションをツリービューに表示する列の値に変換
+
+        Args:
+            action: アクションの辞書
+
+        Returns:
+            (タイプ, ファイル名, 移動元, 移動先, サイズ) のタプル
+        """
+        return (
+            action['type'],
+            action.get('filename') or os.path.basename(action['source']),
+            action['source'],
+            action['destination'],
+            _format_size(action.get('size', 0))
+        )
+
+    def _build_search_keys(self, actions: List[Dict[str, Any]]) -> List[Tuple[int, str, int, str]]:
+        """
+        検索用のキーを作成（ディレクトリは _search_dirs に重複なく追加）
+
+        ファイル名は移動元のパスの末尾と同じため、個別には保持しない。
+
+        Args:
+            actions: アクションのリスト
+
+        Returns:
+            (移動元のディレクトリ番号, 移動元のファイル名, 移動先のディレクトリ番号, 移動先のファイル名)
+            のリスト（ファイル名は小文字化済み）
+        """
+        dir_ids: Dict[str, int] = {}
+
+        def dir_id(directory: str) -> int:
+            index = dir_ids.get(directory)
+            if index is None:
+                index = dir_ids[directory] = len(self._search_dirs)
+                self._search_dirs.append(directory.lower())
+            return index
+
+        keys = []
+        for action in actions:
+            source_dir, source_name = os.path.split(action['source'])
+            destination_dir, destination_name = os.path.split(action['destination'])
+            source_name = source_name.lower()
+            destination_name = destination_name.lower()
+            if destination_name == source_name:
+                destination_name = source_name  # 同じ文字列を共有
+            keys.append((dir_id(source_dir), source_name, dir_id(destination_dir), destination_name))
+        return keys
+
+    def _search(self, search_text: str, candidates) -> List[int]:
+        """
+        移動元・移動先のパスに検索文字列を含むアクションを取得
+
+        Args:
+            search_text: 小文字化した検索文字列
+            candidates: 検索するアクションの位置
+
+        Returns:
+            一致したアクションの位置のリスト
+        """
+        search_dirs = self._search_dirs
+        search_keys = self._search_keys
+
+        if os.sep in search_text:
+            # 区切り文字を含む場合はディレクトリとファイル名をまたいで一致しうるため、パス全体で判定
+            join = os.path.join
+            return [
+                index for index in candidates
+                if search_text in join(search_dirs[search_keys[index][0]], search_keys[index][1])
+                or search_text in join(search_dirs[search_keys[index][2]], search_keys[index][3])
+            ]
+
+        # 区切り文字を含まない場合はディレクトリとファイル名のどちらかに含まれるため、
+        # ディレクトリの判定は1回ずつで済む
+        dir_matches = [search_text in directory for directory in search_dirs]
+        matches = []
+        for index in candidates:
+            source_dir, source_name, destination_dir, destination_name = search_keys[index]
+            if (dir_matches[source_dir] or search_text in source_name
+                    or dir_matches[destination_dir] or search_text in destination_name):
+                matches.append(index)
+        return matches
+
     def _update_statistics(self) -> None:
         """統計情報を更新"""
-        total = len(self.filtered_actions)
-        total_size = sum(action.get('size', 0) for action in self.filtered_actions)
+        total = len(self.filtered_indices)
 
-        stats_text = f"表示中: {total}件 / 合計: {len(self.actions)}件 | サイズ: {self._format_size(total_size)}"
+        stats_text = f"表示中: {total}件 / 合計: {len(self.actions)}件 | サイズ: {_format_size(self._filtered_size)}"
         self.stats_label.config(text=stats_text)
 
     def _select_all(self) -> None:
-        """すべてのアイテムを選択"""
-        for item in self.tree.get_children():
-            self.tree.selection_add(item)
+        """すべてのアイテムを選択（未表示の行は表示時に選択）"""
+        self._select_all_rows = True
+        self.tree.selection_set(self.tree.get_children())
 
     def _deselect_all(self) -> None:
         """すべての選択を解除"""
-        self.tree.selection_remove(self.tree.selection())
+        self._select_all_rows = False
+        self.tree.selection_set(())
 
     def _on_confirm(self) -> None:
         """実行ボタンが押された時の処理"""
@@ -248,14 +455,17 @@ class PreviewDialog(tk.Toplevel):
 
         if not selected_items:
             # 何も選択されていない場合は全て実行
-            self.selected_actions = self.filtered_actions
+            indices = self.filtered_indices
         else:
             # 選択されたアイテムのみ実行
-            self.selected_actions = []
-            for item in selected_items:
-                index = int(self.tree.item(item, 'text')) - 1
-                if 0 <= index < len(self.filtered_actions):
-                    self.selected_actions.append(self.filtered_actions[index])
+            indices = [self._item_indices[item] for item in selected_items
+                       if item in self._item_indices]
+
+            # 「全て選択」後にまだ表示されていない行は選択されているものとして扱う
+            if self._select_all_rows and len(selected_items) >= self._rendered_count:
+                indices.extend(self.filtered_indices[self._rendered_count:])
+
+        self.selected_actions = [self.actions[index] for index in indices]
 
         self.confirmed = True
         self.destroy()
@@ -265,6 +475,15 @@ class PreviewDialog(tk.Toplevel):
         self.confirmed = False
         self.destroy()
 
+    def destroy(self) -> None:
+        """予約中のフィルター適用と行の追加を取り消してからウィンドウを破棄"""
+        for after_id in (self._filter_after_id, self._render_after_id):
+            if after_id is not None:
+                self.after_cancel(after_id)
+        self._filter_after_id = None
+        self._render_after_id = None
+        super().destroy()
+
     def get_confirmed_actions(self) -> Optional[List[Dict[str, Any]]]:
         """
         確認されたアクションのリストを取得
@@ -276,17 +495,6 @@ class PreviewDialog(tk.Toplevel):
             return self.selected_actions
         return None
 
-    @staticmethod
-    def _format_size(size_bytes: int) -> str:
-        """
-        バイト数を人間が読みやすい形式に変換
-        """
-        for unit in ['B', 'KB', 'MB', 'GB', 'TB']:
-            if size_bytes < 1024.0:
-                return f"{size_bytes:.1f} {unit}"
-            size_bytes /= 1024.0
-        return f"{size_bytes:.1f} PB"
-
     def center_window(self) -> None:
         """ウィンドウを画面中央に配置"""
         self.update_idletasks()
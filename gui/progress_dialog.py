@@ -3,10 +3,17 @@
 ファイル整理の進捗状況を表示
 """
 
+import time
 import tkinter as tk
 from tkinter import ttk
 from typing import Optional
 
+# 進捗表示の最大再描画回数（回/秒）
+_DEFAULT_REDRAW_RATE = 20.0
+
+# 不定プログレスバーのアニメーション間隔（ミリ秒）
+_DEFAULT_ANIMATION_INTERVAL_MS = 80
+
 
 class ProgressDialog(tk.Toplevel):
     """進捗状況を表示するダイアログ"""
@@ -27,6 +34,17 @@ class ProgressDialog(tk.Toplevel):
         self.is_cancelled = False
         self.cancelable = cancelable
 
+        # 再描画の間引き（短い間隔の更新はまとめて最新の値だけ表示する）
+        self._min_interval = 1.0 / _DEFAULT_REDRAW_RATE
+        self._last_flush_ts = 0.0
+        self._last_current: Optional[int] = None
+        self._last_message = ""
+        self._pending_value: Optional[int] = None
+        self._pending_status: Optional[str] = None
+        self._pending_title: Optional[str] = None
+        self._flush_after_id: Optional[str] = None
+        self._flush_delayed = False  # 予約中の描画が after_idle ではなく after によるものか
+
         # ウィンドウの設定
         self.geometry("500x200")
         self.resizable(False, False)
@@ -98,27 +116,91 @@ class ProgressDialog(tk.Toplevel):
         """
         進捗を更新
 
+        表示への反映はイベントループがアイドルになった時にまとめて行い、
+        再描画は最大で set_redraw_rate() の回数/秒に間引く。
+
         Args:
             current: 現在の進捗（処理したアイテム数）
             message: 表示するメッセージ
         """
+        if current == self._last_current and message == self._last_message:
+            return
+
         self.current_item = current
+        self._last_current = current
+        self._last_message = message
+        self._pending_value = current
+        if message:
+            self._pending_status = message
 
-        # プログレスバーを更新
-        self.progress_bar['value'] = current
+        elapsed = time.monotonic() - self._last_flush_ts
+        if elapsed >= self._min_interval or current >= self.total_items:
+            self._schedule_flush()
+        else:
+            # 更新が途切れても最後の値が表示されるよう描画を予約
+            self._schedule_flush(max(1, int((self._min_interval - elapsed) * 1000)))
 
-        # 進捗テキストを更新
-        percentage = (current / self.total_items * 100) if self.total_items > 0 else 0
-        self.progress_text.config(
-            text=f"{current} / {self.total_items} ({percentage:.1f}%)"
-        )
+    def set_redraw_rate(self, hz: float) -> None:
+        """
+        進捗表示の最大再描画回数を設定
+
+        Args:
+            hz: 1秒あたりの最大再描画回数（0以下の場合は間引かない）
+        """
+        self._min_interval = 1.0 / hz if hz > 0 else 0.0
+
+    def _schedule_flush(self, delay_ms: int = 0) -> None:
+        """
+        保留中の表示更新の反映を予約
+
+        Args:
+            delay_ms: 反映までの待ち時間（0の場合は次のアイドル時）
+        """
+        if self._flush_after_id is not None:
+            # 予約済みの描画より遅らせることはしない
+            if delay_ms or not self._flush_delayed:
+                return
+            self._cancel_flush()
+
+        if delay_ms:
+            self._flush_after_id = self.after(delay_ms, self._flush)
+        else:
+            self._flush_after_id = self.after_idle(self._flush)
+        self._flush_delayed = bool(delay_ms)
+
+    def _flush(self) -> None:
+        """保留中の進捗・ステータス・タイトルを表示に反映"""
+        self._flush_after_id = None
+
+        if self._pending_value is not None:
+            current = self._pending_value
+            self._pending_value = None
+
+            # プログレスバーを更新
+            self.progress_bar['value'] = current
+
+            # 進捗テキストを更新
+            percentage = (current / self.total_items * 100) if self.total_items > 0 else 0
+            self.progress_text.config(
+                text=f"{current} / {self.total_items} ({percentage:.1f}%)"
+            )
 
         # メッセージを更新
-        if message:
-            self.status_label.config(text=message)
+        if self._pending_status is not None:
+            self.status_label.config(text=self._pending_status)
+            self._pending_status = None
 
-        # UIを更新
-        self.update_idletasks()
+        if self._pending_title is not None:
+            self.title_label.config(text=self._pending_title)
+            self._pending_title = None
+
+        self._last_flush_ts = time.monotonic()
+
+    def _cancel_flush(self) -> None:
+        """予約中の表示更新を取り消し"""
+        if self._flush_after_id is not None:
+            self.after_cancel(self._flush_after_id)
+            self._flush_after_id = None
 
     def set_status(self, status_text: str) -> None:
         """
@@ -127,8 +209,8 @@ class ProgressDialog(tk.Toplevel):
         Args:
             status_text: 表示するステータス
         """
-        self.status_label.config(text=status_text)
-        self.update_idletasks()
+        self._pending_status = status_text
+        self._schedule_flush()
 
     def set_title(self, title_text: str) -> None:
         """
@@ -137,8 +219,8 @@ class ProgressDialog(tk.Toplevel):
         Args:
             title_text: 表示するタイトル
         """
-        self.title_label.config(text=title_text)
-        self.update_idletasks()
+        self._pending_title = title_text
+        self._schedule_flush()
 
     def complete(self, message: str = "完了しました") -> None:
         """
@@ -147,14 +229,14 @@ class ProgressDialog(tk.Toplevel):
         Args:
             message: 完了メッセージ
         """
+        self._pending_value = None
         self.progress_bar['value'] = self.total_items
-        self.status_label.config(text=message)
+        self._pending_status = message
+        self._schedule_flush()
 
         if self.cancelable:
             self.cancel_button.config(text="閉じる", command=self.destroy)
 
-        self.update_idletasks()
-
     def cancel_operation(self) -> None:
         """操作をキャンセル"""
         self.is_cancelled = True
@@ -163,8 +245,7 @@ class ProgressDialog(tk.Toplevel):
         """キャンセルボタンが押された時の処理"""
         self.is_cancelled = True
         self.cancel_button.config(state='disabled')
-        self.status_label.config(text="キャンセル中...")
-        self.update_idletasks()
+        self.set_status("キャンセル中...")
 
     def _on_close(self) -> None:
         """ウィンドウを閉じようとした時の処理"""
@@ -180,20 +261,28 @@ class ProgressDialog(tk.Toplevel):
         y = (self.winfo_screenheight() // 2) - (height // 2)
         self.geometry(f'{width}x{height}+{x}+{y}')
 
+    def destroy(self) -> None:
+        """予約中の描画を取り消してからダイアログを破棄"""
+        self._cancel_flush()
+        super().destroy()
+
 
 class IndeterminateProgressDialog(tk.Toplevel):
     """不定進捗を表示するダイアログ（処理数が不明な場合）"""
 
     def __init__(self, parent: tk.Widget, title: str = "処理中",
-                 message: str = "処理を実行中..."):
+                 message: str = "処理を実行中...",
+                 animation_interval_ms: int = _DEFAULT_ANIMATION_INTERVAL_MS):
         """
         Args:
             parent: 親ウィジェット
             title: ダイアログのタイトル
             message: 表示するメッセージ
+            animation_interval_ms: プログレスバーのアニメーション間隔（ミリ秒）
         """
         super().__init__(parent)
         self.title(title)
+        self.animation_interval_ms = animation_interval_ms
 
         # ウィンドウの設定
         self.geometry("400x150")
@@ -231,7 +320,7 @@ class IndeterminateProgressDialog(tk.Toplevel):
             length=300
         )
         self.progress_bar.pack()
-        self.progress_bar.start(10)  # アニメーション開始
+        self.progress_bar.start(self.animation_interval_ms)  # アニメーション開始
 
     def set_message(self, message: str) -> None:
         """
@@ -5,16 +5,73 @@
 
 from PyQt6.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout, QPushButton,
-    QTableWidget, QTableWidgetItem, QHeaderView, QMessageBox,
+    QTableView, QHeaderView, QMessageBox,
     QLabel
 )
-from PyQt6.QtCore import Qt
-from typing import Optional
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex
+from typing import Optional, List, Dict, Any
 import os
 
 from .base_window import BaseDialog
 
 
+# data() / headerData() はセルごとに呼ばれるため、列挙値の属性参照をモジュール読み込み時に済ませる
+_DISPLAY_ROLE = Qt.ItemDataRole.DisplayRole
+_HORIZONTAL = Qt.Orientation.Horizontal
+
+
+class BackupTableModel(QAbstractTableModel):
+    """
+    バックアップ一覧のテーブルモデル
+
+    セルごとのアイテムを生成せず、表示中のセルの値だけをメタデータから返す。
+    """
+
+    # 列ごとの (見出し, メタデータのキー, 値がない場合の表示)
+    _COLUMNS = [
+        ("バックアップID", "backup_id", "不明"),
+        ("作成日時", "timestamp", "不明"),
+        ("ソースディレクトリ", "source_directory", "不明"),
+        ("サイズ", "total_size_formatted", "不明"),
+        ("ファイル数", "file_count", 0),
+    ]
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._rows: List[Dict[str, Any]] = []
+
+    def set_backups(self, backups: List[Dict[str, Any]]) -> None:
+        """
+        表示するバックアップを置き換え
+
+        Args:
+            backups: バックアップのメタデータのリスト
+        """
+        self.beginResetModel()
+        self._rows = backups
+        self.endResetModel()
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._COLUMNS)
+
+    def data(self, index: QModelIndex, role: int = _DISPLAY_ROLE):
+        if role != _DISPLAY_ROLE or not index.isValid():
+            return None
+        _, key, default = self._COLUMNS[index.column()]
+        return str(self._rows[index.row()].get(key, default))
+
+    def headerData(self, section: int, orientation: Qt.Orientation,
+                   role: int = _DISPLAY_ROLE):
+        if role != _DISPLAY_ROLE:
+            return None
+        if orientation == _HORIZONTAL:
+            return self._COLUMNS[section][0]
+        return str(section + 1)
+
+
 class BackupManagerDialog(BaseDialog):
     """バックアップ管理ダイアログ"""
 
@@ -49,14 +106,12 @@ class BackupManagerDialog(BaseDialog):
         layout.addWidget(info_label)
 
         # バックアップ一覧テーブル
-        self.backup_table = QTableWidget()
-        self.backup_table.setColumnCount(5)
-        self.backup_table.setHorizontalHeaderLabels([
-            "バックアップID", "作成日時", "ソースディレクトリ", "サイズ", "ファイル数"
-        ])
+        self.backup_model = BackupTableModel(self)
+        self.backup_table = QTableView()
+        self.backup_table.setModel(self.backup_model)
         self.backup_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
-        self.backup_table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
-        self.backup_table.setSelectionMode(QTableWidget.SelectionMode.SingleSelection)
+        self.backup_table.setSelectionBehavior(QTableView.SelectionBehavior.SelectRows)
+        self.backup_table.setSelectionMode(QTableView.SelectionMode.SingleSelection)
         layout.addWidget(self.backup_table)
 
         # ボタン
@@ -91,31 +146,7 @@ class BackupManagerDialog(BaseDialog):
             return
 
         self.backups = self.backup_manager.list_backups()
-        self.backup_table.setRowCount(0)
-
-        for backup in self.backups:
-            row = self.backup_table.rowCount()
-            self.backup_table.insertRow(row)
-
-            # バックアップID
-            backup_id = backup.get("backup_id", "不明")
-            self.backup_table.setItem(row, 0, QTableWidgetItem(backup_id))
-
-            # 作成日時
-            timestamp = backup.get("timestamp", "不明")
-            self.backup_table.setItem(row, 1, QTableWidgetItem(timestamp))
-
-            # ソースディレクトリ
-            source_dir = backup.get("source_directory", "不明")
-            self.backup_table.setItem(row, 2, QTableWidgetItem(source_dir))
-
-            # サイズ
-            size = backup.get("total_size_formatted", "不明")
-            self.backup_table.setItem(row, 3, QTableWidgetItem(size))
-
-            # ファイル数
-            file_count = str(backup.get("file_count", 0))
-            self.backup_table.setItem(row, 4, QTableWidgetItem(file_count))
+        self.backup_model.set_backups(self.backups)
 
     def _restore_backup(self) -> None:
         """選択されたバックアップを復元"""
@@ -5,17 +5,27 @@
 
 from PyQt6.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout, QPushButton,
-    QTableWidget, QTableWidgetItem, QHeaderView, QMessageBox,
+    QTableView, QHeaderView, QMessageBox,
     QLabel, QLineEdit, QFileDialog, QCheckBox, QGroupBox
 )
-from PyQt6.QtCore import Qt, QThread, pyqtSignal
-from typing import Optional, List, Dict
+from PyQt6.QtCore import Qt, QThread, QTimer, pyqtSignal, QAbstractTableModel, QModelIndex
+from typing import Optional, List, Dict, Set, Tuple
 import os
 
+from config.settings import HASH_CACHE_MAX_AGE, get_hash_cache_file
+from utils.format_utils import format_size
 from .base_window import BaseDialog
 from .qt_progress_dialog import IndeterminateProgressDialog
 
 
+# data() / headerData() はセルごとに呼ばれるため、列挙値の属性参照をモジュール読み込み時に済ませる
+_DISPLAY_ROLE = Qt.ItemDataRole.DisplayRole
+_HORIZONTAL = Qt.Orientation.Horizontal
+
+# 検出がこの時間（ミリ秒）より長くかかる場合だけ進捗ダイアログを表示
+_PROGRESS_DIALOG_DELAY_MS = 300
+
+
 class DuplicateDetectorWorker(QThread):
     """重複検出ワーカー"""
     finished = pyqtSignal(dict)
@@ -28,12 +38,101 @@ class DuplicateDetectorWorker(QThread):
 
     def run(self):
         try:
+            # 前回までのハッシュを再利用するため、最初の検出の前にディスクから読み込む
+            cache_path = get_hash_cache_file()
+            if not self.detector.file_cache:
+                self.detector.load_cache(cache_path)
+
             duplicates = self.detector.find_duplicates(self.directory)
+
+            self.detector.trim_cache(HASH_CACHE_MAX_AGE)
+            self.detector.save_cache(cache_path)
             self.finished.emit(duplicates)
         except Exception as e:
             self.error.emit(str(e))
 
 
+class DuplicateTableModel(QAbstractTableModel):
+    """
+    重複ファイル一覧のテーブルモデル
+
+    検出結果をファイル単位の行に一度だけ展開し、各セルの表示文字列も
+    その時点で作成しておく（再描画のたびに変換し直さない）。
+    表示文字列は行ごとのタプルではなく列ごとのリストに保持する。
+    """
+
+    _HEADERS = ["ファイル名", "サイズ", "重複数", "パス", "ハッシュ"]
+
+    # パス列の位置
+    _PATH_COLUMN = 3
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        # 列ごとの表示文字列のリスト（列の順）
+        self._columns: Tuple[List[str], ...] = tuple([] for _ in self._HEADERS)
+
+    def set_duplicates(self, duplicates: Dict[str, List[Dict]], show_hash: bool = True) -> None:
+        """
+        表示する検出結果を置き換え
+
+        Args:
+            duplicates: ハッシュ値をキー、ファイル情報のリストを値とする辞書
+                        （2件以上のグループのみ）
+            show_hash: ハッシュ列を表示するか
+        """
+        names: List[str] = []
+        sizes: List[str] = []
+        counts: List[str] = []
+        paths: List[str] = []
+        hashes: List[str] = []
+
+        for file_hash, file_list in duplicates.items():
+            duplicate_count = str(len(file_list))
+            hash_prefix = file_hash[:16] + "..." if show_hash else ""
+            for file_info in file_list:
+                path = file_info.get("path", "")
+                names.append(os.path.basename(path))
+                sizes.append(format_size(file_info.get("size", 0)))
+                counts.append(duplicate_count)
+                paths.append(path)
+                hashes.append(hash_prefix)
+
+        self.beginResetModel()
+        self._columns = (names, sizes, counts, paths, hashes)
+        self.endResetModel()
+
+    def path(self, row: int) -> str:
+        """
+        行のファイルパスを取得
+
+        Args:
+            row: 行番号
+
+        Returns:
+            ファイルパス
+        """
+        return self._columns[self._PATH_COLUMN][row]
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._columns[0])
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._HEADERS)
+
+    def data(self, index: QModelIndex, role: int = _DISPLAY_ROLE):
+        if role != _DISPLAY_ROLE or not index.isValid():
+            return None
+        return self._columns[index.column()][index.row()]
+
+    def headerData(self, section: int, orientation: Qt.Orientation,
+                   role: int = _DISPLAY_ROLE):
+        if role != _DISPLAY_ROLE:
+            return None
+        if orientation == _HORIZONTAL:
+            return self._HEADERS[section]
+        return str(section + 1)
+
+
 class DuplicateDetectorDialog(BaseDialog):
     """重複ファイル検出ダイアログ"""
 
@@ -49,6 +148,7 @@ class DuplicateDetectorDialog(BaseDialog):
         self.duplicates = {}
         self.current_worker = None
         self.current_progress_dialog = None
+        self._detection_running = False
 
         self.setWindowTitle("重複ファイル検出")
         self.setMinimumSize(900, 600)
@@ -103,13 +203,11 @@ class DuplicateDetectorDialog(BaseDialog):
         result_label = QLabel("重複ファイル一覧:")
         layout.addWidget(result_label)
 
-        self.result_table = QTableWidget()
-        self.result_table.setColumnCount(5)
-        self.result_table.setHorizontalHeaderLabels([
-            "ファイル名", "サイズ", "重複数", "パス", "ハッシュ"
-        ])
+        self.result_model = DuplicateTableModel(self)
+        self.result_table = QTableView()
+        self.result_table.setModel(self.result_model)
         self.result_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
-        self.result_table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
+        self.result_table.setSelectionBehavior(QTableView.SelectionBehavior.SelectRows)
         layout.addWidget(self.result_table)
 
         # ボタン
@@ -151,13 +249,13 @@ class DuplicateDetectorDialog(BaseDialog):
             QMessageBox.critical(self, "エラー", "指定されたディレクトリが存在しません")
             return
 
-        # 進捗ダイアログを表示
-        self.current_progress_dialog = IndeterminateProgressDialog(
-            self,
-            title="重複検出中",
-            message="ファイルをスキャンしています..."
-        )
-        self.current_progress_dialog.show()
+        # 検出中の再実行は無視（進捗ダイアログを表示するまではボタンを押せるため）
+        if self._detection_running:
+            return
+
+        # 進捗ダイアログはすぐに終わる検出では作成しない
+        self._detection_running = True
+        QTimer.singleShot(_PROGRESS_DIALOG_DELAY_MS, self._show_progress_if_running)
 
         # ワーカーで実行
         self.current_worker = DuplicateDetectorWorker(
@@ -170,18 +268,36 @@ class DuplicateDetectorDialog(BaseDialog):
 
         self.current_worker.start()
 
+    def _show_progress_if_running(self) -> None:
+        """検出が続いている場合に進捗ダイアログを表示"""
+        if not self._detection_running or self.current_progress_dialog:
+            return
+
+        self.current_progress_dialog = IndeterminateProgressDialog(
+            self,
+            title="重複検出中",
+            message="ファイルをスキャンしています..."
+        )
+        self.current_progress_dialog.show()
+
     def _on_detection_finished(self, duplicates: Dict) -> None:
         """検出完了時の処理"""
+        self._detection_running = False
         if self.current_progress_dialog:
             self.current_progress_dialog.close()
             self.current_progress_dialog.deleteLater()
             self.current_progress_dialog = None
 
-        self.duplicates = duplicates
+        # 1件だけのグループは重複ではないため、表示・集計の前に一度だけ除く
+        self.duplicates = {
+            file_hash: file_list for file_hash, file_list in duplicates.items()
+            if len(file_list) >= 2
+        }
         self._display_results()
 
     def _on_detection_error(self, error: str) -> None:
         """検出エラー時の処理"""
+        self._detection_running = False
         if self.current_progress_dialog:
             self.current_progress_dialog.close()
             self.current_progress_dialog.deleteLater()
@@ -191,7 +307,7 @@ class DuplicateDetectorDialog(BaseDialog):
 
     def _display_results(self) -> None:
         """検出結果を表示"""
-        self.result_table.setRowCount(0)
+        self.result_model.set_duplicates(self.duplicates, self.show_details_check.isChecked())
 
         if not self.duplicates:
             QMessageBox.information(self, "結果", "重複ファイルは見つかりませんでした")
@@ -200,10 +316,7 @@ class DuplicateDetectorDialog(BaseDialog):
         total_duplicates = 0
         total_wasted_space = 0
 
-        for file_hash, file_list in self.duplicates.items():
-            if len(file_list) < 2:
-                continue
-
+        for file_list in self.duplicates.values():
             # 最初のファイルを基準とする
             first_file = file_list[0]
             file_size = first_file.get("size", 0)
@@ -213,33 +326,8 @@ class DuplicateDetectorDialog(BaseDialog):
             total_duplicates += duplicate_count - 1
             total_wasted_space += wasted_space
 
-            # 各重複ファイルを追加
-            for file_info in file_list:
-                row = self.result_table.rowCount()
-                self.result_table.insertRow(row)
-
-                # ファイル名
-                filename = os.path.basename(file_info.get("path", ""))
-                self.result_table.setItem(row, 0, QTableWidgetItem(filename))
-
-                # サイズ
-                size_formatted = self._format_size(file_info.get("size", 0))
-                self.result_table.setItem(row, 1, QTableWidgetItem(size_formatted))
-
-                # 重複数
-                self.result_table.setItem(row, 2, QTableWidgetItem(str(duplicate_count)))
-
-                # パス
-                self.result_table.setItem(row, 3, QTableWidgetItem(file_info.get("path", "")))
-
-                # ハッシュ（詳細表示時のみ）
-                if self.show_details_check.isChecked():
-                    self.result_table.setItem(row, 4, QTableWidgetItem(file_hash[:16] + "..."))
-                else:
-                    self.result_table.setItem(row, 4, QTableWidgetItem(""))
-
         # 結果メッセージ
-        wasted_formatted = self._format_size(total_wasted_space)
+        wasted_formatted = format_size(total_wasted_space)
         QMessageBox.information(
             self,
             "検出完了",
@@ -250,21 +338,14 @@ class DuplicateDetectorDialog(BaseDialog):
 
     def _delete_selected(self) -> None:
         """選択されたファイルを削除"""
-        selected_rows = self.result_table.selectedIndexes()
+        # 行単位で選択を取得（セル単位の selectedIndexes より少なく、重複もない）
+        selected_rows = self.result_table.selectionModel().selectedRows()
         if not selected_rows:
             QMessageBox.warning(self, "警告", "削除するファイルを選択してください")
             return
 
-        # 選択された行を取得
-        rows_to_delete = set()
-        for index in selected_rows:
-            rows_to_delete.add(index.row())
-
-        files_to_delete = []
-        for row in sorted(rows_to_delete):
-            path_item = self.result_table.item(row, 3)
-            if path_item:
-                files_to_delete.append(path_item.text())
+        rows_to_delete = sorted(index.row() for index in selected_rows)
+        files_to_delete = [self.result_model.path(row) for row in rows_to_delete]
 
         # 確認
         reply = QMessageBox.question(
@@ -278,18 +359,22 @@ class DuplicateDetectorDialog(BaseDialog):
         if reply != QMessageBox.StandardButton.Yes:
             return
 
-        # 削除
+        # 削除（存在確認はせず、既に無いファイルは FileNotFoundError で判定）
         deleted_count = 0
         failed_count = 0
+        removed_paths = set()
 
         for file_path in files_to_delete:
             try:
-                if os.path.exists(file_path):
-                    os.remove(file_path)
-                    deleted_count += 1
+                os.remove(file_path)
+                deleted_count += 1
+            except FileNotFoundError:
+                pass
             except Exception as e:
                 failed_count += 1
                 print(f"エラー: {file_path} の削除に失敗: {e}")
+                continue
+            removed_paths.add(file_path)
 
         # 結果表示
         QMessageBox.information(
@@ -298,15 +383,26 @@ class DuplicateDetectorDialog(BaseDialog):
             f"削除完了\n\n成功: {deleted_count}件\n失敗: {failed_count}件"
         )
 
-        # 再検索
-        if deleted_count > 0:
-            self._start_detection()
-
-    @staticmethod
-    def _format_size(size_bytes: int) -> str:
-        """バイト数を人間が読みやすい形式に変換"""
-        for unit in ['B', 'KB', 'MB', 'GB', 'TB']:
-            if size_bytes < 1024.0:
-                return f"{size_bytes:.2f} {unit}"
-            size_bytes /= 1024.0
-        return f"{size_bytes:.2f} PB"
+        # ディレクトリを再検索せず、削除したファイルを検出結果から除く
+        if removed_paths:
+            self._remove_from_results(removed_paths)
+
+    def _remove_from_results(self, removed_paths: Set[str]) -> None:
+        """
+        削除したファイルを検出結果と表示から除く
+
+        Args:
+            removed_paths: 削除したファイルのパス
+        """
+        remaining = {}
+        for file_hash, file_list in self.duplicates.items():
+            file_list = [
+                file_info for file_info in file_list
+                if file_info.get("path", "") not in removed_paths
+            ]
+            # 1件だけ残ったファイルは重複ではなくなる
+            if len(file_list) >= 2:
+                remaining[file_hash] = file_list
+
+        self.duplicates = remaining
+        self.result_model.set_duplicates(self.duplicates, self.show_details_check.isChecked())
@@ -19,7 +19,7 @@ from utils import OperationLogger, BackupManager
 from .qt_progress_dialog import ProgressDialog, IndeterminateProgressDialog
 from .qt_preview_dialog import PreviewDialog
 from .qt_rule_editor import RuleEditorDialog
-from .qt_workers import OrganizeWorker, ExecuteWorker, UndoWorker, BackupWorker
+from .qt_workers import OrganizeWorker, ExecuteWorker, OrganizeExecuteWorker, UndoWorker, BackupWorker
 from .qt_log_viewer import LogViewerDialog
 from .qt_backup_manager import BackupManagerDialog
 from .qt_duplicate_detector import DuplicateDetectorDialog
@@ -260,7 +260,7 @@ class QtMainWindow(QMainWindow):
         file_path, _ = QFileDialog.getOpenFileName(
             self,
             "ルールファイルを開く",
-            "data/rules",
+            self.rule_engine.rules_dir,
             "JSONファイル (*.json);;すべてのファイル (*.*)"
         )
 
@@ -280,7 +280,7 @@ class QtMainWindow(QMainWindow):
         file_path, _ = QFileDialog.getSaveFileName(
             self,
             "ルールを保存",
-            "data/rules",
+            self.rule_engine.rules_dir,
             "JSONファイル (*.json);;すべてのファイル (*.*)"
         )
 
@@ -492,22 +492,59 @@ class QtMainWindow(QMainWindow):
         source_dir = self.source_dir_edit.text()
         output_dir = self.output_dir_edit.text() or source_dir
 
-        # アクション生成（まだ生成していない場合）
+        # プレビュー済みのアクションがなければ、走査・分類と実行をワーカーで並行して行う
         if not self.current_actions:
-            operation_mode = "move" if self.move_radio.isChecked() else "copy"
-            self.current_actions = self.organizer.organize(
-                source_dir,
-                self.current_rules,
-                output_dir,
-                preview_mode=False,
-                operation_mode=operation_mode
-            )
+            self._organize_and_execute(source_dir, output_dir)
+            return
 
-        if not self.current_actions:
+        self._execute_with_actions(self.current_actions)
+
+    def _organize_and_execute(self, source_dir: str, output_dir: str) -> None:
+        """走査・分類しながらアクションを実行（総数は走査の進行に合わせて更新）"""
+        # 進捗ダイアログを表示（総数が判明するまでは不定表示）
+        self.current_progress_dialog = ProgressDialog(
+            self,
+            title="整理実行中",
+            total_items=0
+        )
+        self.current_progress_dialog.show()
+
+        # ワーカーで実行
+        self.current_worker = OrganizeExecuteWorker(
+            self.organizer,
+            source_dir,
+            self.current_rules,
+            output_dir,
+            operation_mode="move" if self.move_radio.isChecked() else "copy",
+            skip_existing=self.skip_existing_check.isChecked()
+        )
+
+        self.current_worker.progress.connect(self._on_organize_execute_progress)
+        self.current_worker.finished.connect(
+            lambda result: self._after_organize_and_execute(result, self.current_progress_dialog)
+        )
+        self.current_worker.error.connect(
+            lambda error: self._handle_worker_error(error, self.current_progress_dialog)
+        )
+
+        self.current_worker.start()
+
+    def _on_organize_execute_progress(self, current: int, total: int, message: str) -> None:
+        """走査と並行した実行の進捗を表示"""
+        if self.current_progress_dialog:
+            self.current_progress_dialog.set_total(total)
+            self.current_progress_dialog.update_progress(current, message)
+
+    def _after_organize_and_execute(self, result, progress_dialog) -> None:
+        """走査と並行した実行の後の処理"""
+        if result["total_actions"] == 0:
+            if progress_dialog:
+                progress_dialog.close()
+                progress_dialog.deleteLater()
             QMessageBox.information(self, "情報", "整理するファイルがありません")
             return
 
-        self._execute_with_actions(self.current_actions)
+        self._after_execute(result, progress_dialog)
 
     def _execute_with_actions(self, actions) -> None:
         """アクションを実行"""
@@ -715,3 +752,12 @@ Version 2.0.0 (PyQt6)
     def update_status(self, message: str) -> None:
         """ステータスバーを更新"""
         self.statusBar().showMessage(message)
+
+    def closeEvent(self, event) -> None:
+        """ウィンドウを閉じる時の処理"""
+        if self.watcher and self.watcher.is_watching:
+            # 監視の終了はバックグラウンドで行われるため、短時間だけ待機して閉じる
+            self.watcher.stop_watching()
+            self.watcher.stopped_event.wait(0.1)
+            self.watcher = None
+        event.accept()
@@ -124,6 +124,18 @@ class ProgressDialog(BaseDialog):
         # UIを更新
         self.repaint()
 
+    def set_total(self, total_items: int) -> None:
+        """
+        総アイテム数を変更（処理しながら件数が判明する場合）
+
+        Args:
+            total_items: 処理する総アイテム数
+        """
+        if total_items == self.total_items:
+            return
+        self.total_items = total_items
+        self.progress_bar.setMaximum(total_items)
+
     def set_status(self, status_text: str) -> None:
         """
         ステータステキストを設定
@@ -88,6 +88,50 @@ class ExecuteWorker(QThread):
             self.error.emit(str(e))
 
 
+class OrganizeExecuteWorker(QThread):
+    """走査・分類と実行を並行して行うワーカースレッド（プレビューなしの整理）"""
+
+    # シグナル
+    progress = pyqtSignal(int, int, str)  # current, total（走査済みの件数）, message
+    finished = pyqtSignal(dict)  # result
+    error = pyqtSignal(str)  # error message
+
+    def __init__(
+        self,
+        organizer,
+        source_dir: str,
+        rules: Dict,
+        output_dir: str,
+        operation_mode: str,
+        skip_existing: bool
+    ):
+        super().__init__()
+        self.organizer = organizer
+        self.source_dir = source_dir
+        self.rules = rules
+        self.output_dir = output_dir
+        self.operation_mode = operation_mode
+        self.skip_existing = skip_existing
+
+    def run(self):
+        """スレッド実行"""
+        try:
+            def progress_callback(current: int, total: int, message: str):
+                self.progress.emit(current, total, message)
+
+            result = self.organizer.organize_and_execute(
+                self.source_dir,
+                self.rules,
+                self.output_dir,
+                operation_mode=self.operation_mode,
+                callback=progress_callback,
+                skip_existing=self.skip_existing
+            )
+            self.finished.emit(result)
+        except Exception as e:
+            self.error.emit(str(e))
+
+
 class UndoWorker(QThread):
     """元に戻す操作のワーカースレッド"""
 
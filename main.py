@@ -20,6 +20,7 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 from PyQt6.QtWidgets import QApplication
 from gui import MainWindow, ThemeManager, ThemeType
 from config import settings
+from utils import configure_logging
 
 
 def main():
@@ -28,6 +29,9 @@ def main():
         # 必要なディレクトリの確認
         settings.ensure_directories()
 
+        # ログ出力をバックグラウンドのスレッドで行う
+        log_listener = configure_logging()
+
         # QApplicationを作成
         app = QApplication(sys.argv)
 
@@ -39,7 +43,11 @@ def main():
         window.show()
 
         # イベントループを開始
-        sys.exit(app.exec())
+        exit_code = app.exec()
+
+        # 未出力のログを書き出してから終了
+        log_listener.stop()
+        sys.exit(exit_code)
 
     except KeyboardInterrupt:
         print("\n\nアプリケーションを終了します...")
@@ -3,13 +3,19 @@
 ログ記録、バックアップ、ハッシュ計算などの補助機能を提供
 """
 
-from .logger import OperationLogger
+from .logger import OperationLogger, configure_logging
 from .backup import BackupManager
 from .hash_utils import calculate_file_hash, hash_file_chunks
+from .format_utils import format_size
+from .pattern_utils import ExclusionMatcher, compile_exclusion_patterns
 
 __all__ = [
     'OperationLogger',
+    'configure_logging',
     'BackupManager',
     'calculate_file_hash',
-    'hash_file_chunks'
+    'hash_file_chunks',
+    'format_size',
+    'ExclusionMatcher',
+    'compile_exclusion_patterns'
 ]
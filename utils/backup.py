@@ -10,19 +10,25 @@ from datetime import datetime
 from typing import Optional, List, Dict
 import uuid
 
+from config import settings
+from .format_utils import format_size
+
 
 class BackupManager:
     """バックアップを管理するクラス"""
 
-    def __init__(self, backup_dir: str = "data/backups"):
+    def __init__(self, backup_dir: Optional[str] = None):
         """
         Args:
-            backup_dir: バックアップを保存するディレクトリ
+            backup_dir: バックアップを保存するディレクトリ（Noneの場合は settings.BACKUPS_DIR）
         """
-        self.backup_dir = backup_dir
+        if backup_dir is None:
+            backup_dir = settings.get_backups_dir()
+        else:
+            # バックアップディレクトリが存在しない場合は作成
+            os.makedirs(backup_dir, exist_ok=True)
 
-        # バックアップディレクトリが存在しない場合は作成
-        os.makedirs(self.backup_dir, exist_ok=True)
+        self.backup_dir = backup_dir
 
     def create_backup(self, source_dir: str, backup_name: Optional[str] = None,
                      include_subdirs: bool = True) -> Optional[str]:
@@ -112,7 +118,7 @@ class BackupManager:
 
             print(f"バックアップが作成されました: {backup_id}")
             print(f"  ファイル数: {len(files_backed_up)}")
-            print(f"  合計サイズ: {self._format_size(metadata['total_size'])}")
+            print(f"  合計サイズ: {format_size(metadata['total_size'])}")
 
             return backup_id
 
@@ -147,7 +153,7 @@ class BackupManager:
                             "source_directory": metadata["source_directory"],
                             "total_files": metadata["total_files"],
                             "total_size": metadata["total_size"],
-                            "size_formatted": self._format_size(metadata["total_size"])
+                            "size_formatted": format_size(metadata["total_size"])
                         })
 
             # タイムスタンプで降順ソート
@@ -300,20 +306,3 @@ class BackupManager:
         except Exception as e:
             print(f"エラー: バックアップ情報の取得中にエラーが発生しました: {e}")
             return None
-
-    @staticmethod
-    def _format_size(size_bytes: int) -> str:
-        """
-        バイト数を人間が読みやすい形式に変換
-
-        Args:
-            size_bytes: バイト数
-
-        Returns:
-            フォーマットされたサイズ文字列
-        """
-        for unit in ['B', 'KB', 'MB', 'GB', 'TB']:
-            if size_bytes < 1024.0:
-                return f"{size_bytes:.2f} {unit}"
-            size_bytes /= 1024.0
-        return f"{size_bytes:.2f} PB"
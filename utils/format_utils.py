@@ -0,0 +1,32 @@
+"""
+表示用フォーマットユーティリティ
+ファイルサイズなどを人間が読みやすい文字列に変換
+"""
+
+from functools import lru_cache
+
+# サイズ表記の単位（1024倍ごと）
+_SIZE_UNITS = ('B', 'KB', 'MB', 'GB', 'TB', 'PB')
+
+
+@lru_cache(maxsize=4096)
+def format_size(size_bytes: int) -> str:
+    """
+    バイト数を人間が読みやすい形式に変換（同じサイズの結果は再利用）
+
+    2^(10*i) 以上 2^(10*(i+1)) 未満の値は単位 i とし、単位をビット長から
+    直接求める（1024で割り続けるのと同じ結果）。
+
+    Args:
+        size_bytes: バイト数
+
+    Returns:
+        フォーマットされたサイズ文字列（例: "1.50 MB"）
+    """
+    if size_bytes < 1024:
+        return f"{size_bytes:.2f} B"
+
+    unit = (int(size_bytes).bit_length() - 1) // 10
+    if unit > 5:
+        unit = 5
+    return f"{size_bytes / (1 << (10 * unit)):.2f} {_SIZE_UNITS[unit]}"
@@ -4,8 +4,67 @@
 """
 
 import hashlib
+import os
 from typing import Optional
 
+# 高速な非暗号学的ハッシュ（任意の依存関係）
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+
+try:
+    import blake3
+except ImportError:
+    blake3 = None
+
+# xxhash / blake3 が利用できない場合に使用するhashlibのアルゴリズム
+FALLBACK_HASH_ALGORITHM = 'blake2b'
+
+
+def resolve_hash_algorithm(algorithm: str) -> str:
+    """
+    実際に使用されるハッシュアルゴリズム名を取得
+
+    xxHash 系と blake3 は対応パッケージが未インストールの場合
+    FALLBACK_HASH_ALGORITHM に置き換わるため、キャッシュなどに記録する
+    アルゴリズム名はこの関数の結果を使用する。
+
+    Args:
+        algorithm: 指定したハッシュアルゴリズム名
+
+    Returns:
+        new_hash() が実際に使用するアルゴリズム名
+    """
+    if algorithm.startswith('xxh'):
+        return algorithm if xxhash is not None else FALLBACK_HASH_ALGORITHM
+    if algorithm == 'blake3':
+        return algorithm if blake3 is not None else FALLBACK_HASH_ALGORITHM
+    return algorithm
+
+
+def new_hash(algorithm: str = 'sha256'):
+    """
+    ハッシュオブジェクトを作成
+
+    xxh3_128 などの xxHash 系と blake3 は対応パッケージがインストールされて
+    いる場合のみ使用し、未インストールの場合は FALLBACK_HASH_ALGORITHM を使用する。
+    重複検出は悪意のある衝突を想定しないため、128ビットの出力で十分
+    （誕生日攻撃の限界から 2^40 ファイル程度までは衝突確率が無視できる）。
+
+    Args:
+        algorithm: ハッシュアルゴリズム名（xxh3_128, blake3, sha256など）
+
+    Returns:
+        update() / hexdigest() を持つハッシュオブジェクト
+    """
+    algorithm = resolve_hash_algorithm(algorithm)
+    if algorithm.startswith('xxh'):
+        return getattr(xxhash, algorithm)()
+    if algorithm == 'blake3':
+        return blake3.blake3()
+    return hashlib.new(algorithm)
+
 
 def calculate_file_hash(file_path: str, algorithm: str = 'sha256', chunk_size: int = 8192) -> Optional[str]:
     """
@@ -13,7 +72,7 @@ def calculate_file_hash(file_path: str, algorithm: str = 'sha256', chunk_size: i
 
     Args:
         file_path: ハッシュを計算するファイルのパス
-        algorithm: 使用するハッシュアルゴリズム（md5, sha1, sha256など）
+        algorithm: 使用するハッシュアルゴリズム（xxh3_128, blake3, md5, sha256など）
         chunk_size: 一度に読み込むバイト数（メモリ効率のため）
 
     Returns:
@@ -21,7 +80,7 @@ def calculate_file_hash(file_path: str, algorithm: str = 'sha256', chunk_size: i
     """
     try:
         # ハッシュオブジェクトの作成
-        hash_obj = hashlib.new(algorithm)
+        hash_obj = new_hash(algorithm)
 
         # ファイルをチャンクごとに読み込んでハッシュを更新
         with open(file_path, 'rb') as f:
@@ -93,27 +152,53 @@ def hash_file_chunks(file_path: str, num_chunks: int = 3, chunk_size: int = 8192
         return None
 
 
-def get_quick_file_signature(file_path: str) -> Optional[tuple]:
+def get_quick_file_signature(file_path: str, chunk_size: int = 4096) -> Optional[tuple]:
     """
-    ファイルの高速シグネチャを取得（サイズ + 部分ハッシュ）
+    ファイルの高速シグネチャを取得（サイズ + 先頭・末尾の部分ハッシュ）
     大量のファイル比較の第一段階として使用
 
+    os.pread が使える環境ではファイルオブジェクトのバッファリングを介さずに
+    指定位置を直接読み込む。第一段階のフィルタなので高速な xxh3_64 を使用する
+    （衝突しても完全ハッシュで再確認される）。
+
     Args:
         file_path: ファイルのパス
+        chunk_size: 先頭・末尾から読み込むバイト数
 
     Returns:
         (ファイルサイズ, 部分ハッシュ) のタプル。エラー時はNone
     """
     try:
-        import os
-        file_size = os.path.getsize(file_path)
-        partial_hash = hash_file_chunks(file_path, num_chunks=2, chunk_size=4096)
-
-        if partial_hash is None:
-            return None
-
-        return (file_size, partial_hash)
+        if hasattr(os, 'pread'):
+            fd = os.open(file_path, os.O_RDONLY)
+            try:
+                file_size = os.fstat(fd).st_size
+                head = os.pread(fd, chunk_size, 0)
+                tail = os.pread(fd, chunk_size, file_size - chunk_size) if file_size > chunk_size else b''
+            finally:
+                os.close(fd)
+        else:
+            # Windows など os.pread が使えない環境
+            with open(file_path, 'rb') as f:
+                file_size = os.fstat(f.fileno()).st_size
+                head = f.read(chunk_size)
+                tail = b''
+                if file_size > chunk_size:
+                    f.seek(file_size - chunk_size)
+                    tail = f.read(chunk_size)
+
+        hash_obj = new_hash('xxh3_64')
+        hash_obj.update(head)
+        hash_obj.update(tail)
+
+        return (file_size, hash_obj.hexdigest())
 
+    except FileNotFoundError:
+        print(f"エラー: ファイルが見つかりません: {file_path}")
+        return None
+    except PermissionError:
+        print(f"エラー: ファイルへのアクセス権限がありません: {file_path}")
+        return None
     except Exception as e:
         print(f"エラー: ファイルシグネチャ取得中にエラーが発生しました: {e}")
         return None
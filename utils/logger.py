@@ -4,27 +4,63 @@
 """
 
 import json
+import logging
+import logging.handlers
 import os
+import queue
+import sys
 from datetime import datetime
-from typing import List, Dict, Optional, Any
+from typing import Iterable, List, Dict, Optional, Any, Tuple
 import uuid
 
+from config import settings
+
+
+def configure_logging(level: int = logging.INFO) -> logging.handlers.QueueListener:
+    """
+    アプリケーションのログ出力を設定
+
+    ルートロガーにはキューへ追加するだけのハンドラーを登録し、書式化と標準出力への
+    書き込みはリスナーのスレッドで行う（監視スレッドなどが出力のロックを待たない）。
+
+    Args:
+        level: 出力するログレベル
+
+    Returns:
+        開始済みのQueueListener（終了時に stop() を呼び出す）
+    """
+    log_queue = queue.SimpleQueue()
+
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(logging.Formatter("%(message)s"))
+    listener = logging.handlers.QueueListener(log_queue, stream_handler, respect_handler_level=True)
+
+    root_logger = logging.getLogger()
+    root_logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    root_logger.setLevel(level)
+
+    listener.start()
+    return listener
+
 
 class OperationLogger:
     """操作ログを管理するクラス"""
 
-    def __init__(self, log_dir: str = "data/logs"):
+    def __init__(self, log_dir: Optional[str] = None):
         """
         Args:
-            log_dir: ログファイルを保存するディレクトリ
+            log_dir: ログファイルを保存するディレクトリ（Noneの場合は settings.LOGS_DIR）
         """
+        if log_dir is None:
+            log_dir = settings.get_logs_dir()
+        else:
+            # ログディレクトリが存在しない場合は作成
+            os.makedirs(log_dir, exist_ok=True)
+
         self.log_dir = log_dir
         self.current_operation_id = None
         self.current_actions = []
 
-        # ログディレクトリが存在しない場合は作成
-        os.makedirs(self.log_dir, exist_ok=True)
-
     def start_operation(self) -> str:
         """
         新しい操作セッションを開始
@@ -58,6 +94,31 @@ class OperationLogger:
         }
         self.current_actions.append(action)
 
+    def log_actions_bulk(self, records: Iterable[Tuple]) -> None:
+        """
+        複数のアクションをまとめて記録
+
+        Args:
+            records: (action_type, source, destination, status, metadata, timestamp) のタプルの列。
+                    timestampはISO形式の文字列（Noneの場合は記録時の時刻）
+        """
+        now = None
+        actions = []
+        for action_type, source, destination, status, metadata, timestamp in records:
+            if timestamp is None:
+                if now is None:
+                    now = datetime.now().isoformat()
+                timestamp = now
+            actions.append({
+                "type": action_type,
+                "source": source,
+                "destination": destination,
+                "status": status,
+                "timestamp": timestamp,
+                "metadata": metadata or {}
+            })
+        self.current_actions.extend(actions)
+
     def save_log(self, operation_name: str = "File Organization") -> str:
         """
         現在の操作ログをファイルに保存
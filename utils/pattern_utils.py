@@ -0,0 +1,98 @@
+"""
+パターンマッチングユーティリティ
+除外パターンなどのファイル名パターンを高速に判定
+"""
+
+import re
+from typing import Iterable, Optional, Pattern, Tuple
+
+# 正規表現のメタ文字を含まないリテラル部分（\. のようにエスケープされた記号は可）
+_LITERAL = r"(?:\\[^A-Za-z0-9]|[^\\.*+?{}()\[\]|^$])+"
+
+# "^prefix.*" 形式のパターン
+_PREFIX_PATTERN = re.compile(rf"\^({_LITERAL})\.\*")
+
+# ".*suffix$" 形式のパターン
+_SUFFIX_PATTERN = re.compile(rf"\.\*({_LITERAL})\$")
+
+
+def _unescape(literal: str) -> str:
+    """エスケープされた記号を元の文字に戻す"""
+    return re.sub(r"\\(.)", r"\1", literal)
+
+
+class ExclusionMatcher:
+    """
+    ファイル名が除外パターンに一致するかを判定するクラス
+
+    "^prefix.*" / ".*suffix$" 形式の単純なパターンは str.startswith /
+    str.endswith で判定し、それ以外のパターンは1つの正規表現に結合して
+    1回の match で判定する。
+    """
+
+    def __init__(self, prefixes: Tuple[str, ...], suffixes: Tuple[str, ...],
+                 regex: Optional[Pattern] = None):
+        """
+        Args:
+            prefixes: 前方一致で判定する文字列
+            suffixes: 後方一致で判定する文字列
+            regex: 残りのパターンを結合した正規表現
+        """
+        self.prefixes = prefixes
+        self.suffixes = suffixes
+        self.regex = regex
+
+    def match(self, name: str) -> bool:
+        """
+        ファイル名がいずれかのパターンに一致するかを判定
+
+        Args:
+            name: ファイル名
+
+        Returns:
+            一致する場合True
+        """
+        if self.prefixes and name.startswith(self.prefixes):
+            return True
+        if self.suffixes and name.endswith(self.suffixes):
+            return True
+        return self.regex is not None and self.regex.match(name) is not None
+
+
+def compile_exclusion_patterns(patterns: Iterable[str]) -> ExclusionMatcher:
+    """
+    除外パターンのリストを判定用オブジェクトにコンパイル
+
+    Args:
+        patterns: 正規表現パターンのリスト（例: [r"^\\..*", r".*\\.tmp$"]）
+
+    Returns:
+        ExclusionMatcherインスタンス
+    """
+    prefixes = []
+    suffixes = []
+    regexes = []
+
+    for pattern in patterns:
+        match = _PREFIX_PATTERN.fullmatch(pattern)
+        if match:
+            prefixes.append(_unescape(match.group(1)))
+            continue
+
+        match = _SUFFIX_PATTERN.fullmatch(pattern)
+        if match:
+            suffixes.append(_unescape(match.group(1)))
+            continue
+
+        # 不正なパターンはここで例外にする
+        re.compile(pattern)
+        regexes.append(pattern)
+
+    # 残りのパターンは非キャプチャグループの選択として1つに結合
+    regex = None
+    if len(regexes) == 1:
+        regex = re.compile(regexes[0])
+    elif regexes:
+        regex = re.compile("|".join(f"(?:{pattern})" for pattern in regexes))
+
+    return ExclusionMatcher(tuple(prefixes), tuple(suffixes), regex)